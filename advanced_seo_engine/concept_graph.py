@@ -5,7 +5,7 @@ Builds and maintains a knowledge graph of SEO concepts, entities, and relationsh
 
 import json
 import re
-from typing import List, Dict, Any, Optional, Set, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable
 from collections import defaultdict
 import networkx as nx
 from pathlib import Path
@@ -79,6 +79,36 @@ class ConceptGraph:
             if source and source not in node['sources']:
                 node['sources'].append(source)
     
+    def add_concepts(self, items: Iterable[Tuple[str, str, Optional[str]]]) -> None:
+        """
+        Add many concepts in one pass (same semantics as add_concept).
+        
+        Args:
+            items: (concept, concept_type, source) tuples
+        
+        New nodes are inserted with a single add_nodes_from; call save()
+        once afterwards.
+        """
+        nodes = self.graph.nodes
+        new_nodes = {}
+        for concept, concept_type, source in items:
+            if concept in new_nodes:
+                attrs = new_nodes[concept]
+            elif concept in nodes:
+                attrs = nodes[concept]
+            else:
+                new_nodes[concept] = {
+                    'type': concept_type,
+                    'sources': [source] if source else [],
+                    'metadata': {},
+                    'mention_count': 1
+                }
+                continue
+            attrs['mention_count'] = attrs.get('mention_count', 0) + 1
+            if source and source not in attrs['sources']:
+                attrs['sources'].append(source)
+        self.graph.add_nodes_from(new_nodes.items())
+    
     def add_relationship(self,
                         source: str,
                         target: str,
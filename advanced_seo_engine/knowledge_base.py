@@ -5,6 +5,7 @@ Advanced embedding-based retrieval system for EPUB content
 
 import os
 import json
+import time
 import hashlib
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
@@ -13,6 +14,18 @@ from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
 
+# Warm embedding server from the top-level app, when it is importable
+try:
+    from embed_server import EMBEDDING_MODEL as SERVER_MODEL, connect_embedder
+except ImportError:
+    SERVER_MODEL = None
+    connect_embedder = None
+
+
+# Seconds a get_stats() result is reused; writes through this object
+# invalidate it immediately
+STATS_TTL = 30.0
+
 
 class VectorKnowledgeBase:
     """
@@ -36,9 +49,14 @@ class VectorKnowledgeBase:
         self.embedding_model_name = embedding_model
         self.collection_name = collection_name
         
-        # Initialize embedding model
-        print(f"Loading embedding model: {embedding_model}")
-        self.embedding_model = SentenceTransformer(embedding_model)
+        # Initialize embedding model, reusing the warm embedding server
+        # when it serves the same model
+        self.embedding_model = None
+        if connect_embedder is not None and embedding_model == SERVER_MODEL:
+            self.embedding_model = connect_embedder()
+        if self.embedding_model is None:
+            print(f"Loading embedding model: {embedding_model}")
+            self.embedding_model = SentenceTransformer(embedding_model)
         
         # Initialize ChromaDB
         self.client = chromadb.Client(Settings(
@@ -54,6 +72,8 @@ class VectorKnowledgeBase:
         
         # Track document sources
         self.sources = {}
+        # (stats, time computed) from the last get_stats()
+        self._stats_cache = None
         
     def embed_text(self, text: str) -> List[float]:
         """Generate embedding for text"""
@@ -77,6 +97,7 @@ class VectorKnowledgeBase:
         """
         total = len(documents)
         print(f"Adding {total} documents to knowledge base...")
+        self._stats_cache = None
         
         for i in range(0, total, batch_size):
             batch = documents[i:i + batch_size]
@@ -231,31 +252,40 @@ class VectorKnowledgeBase:
         }
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get knowledge base statistics"""
+        """Get knowledge base statistics (cached for STATS_TTL seconds)"""
+        if self._stats_cache is not None:
+            stats, computed_at = self._stats_cache
+            if time.monotonic() - computed_at < STATS_TTL:
+                return dict(stats)
+        
         count = self.collection.count()
         
         # Get unique sources
         all_meta = self.collection.get(include=['metadatas'])
-        sources = set()
-        categories = set()
+        metas = [meta for meta in (all_meta['metadatas'] or []) if meta]
         
-        if all_meta['metadatas']:
-            for meta in all_meta['metadatas']:
-                if meta:
-                    sources.add(meta.get('book_title', 'unknown'))
-                    categories.add(meta.get('category', 'unknown'))
+        # Pull each field out once into a column and dedupe it in C
+        sources = np.unique(np.array(
+            [meta.get('book_title', 'unknown') for meta in metas], dtype=object
+        ))
+        categories = np.unique(np.array(
+            [meta.get('category', 'unknown') for meta in metas], dtype=object
+        ))
         
-        return {
+        stats = {
             'total_documents': count,
-            'sources': list(sources),
-            'categories': list(categories),
+            'sources': sources.tolist(),
+            'categories': categories.tolist(),
             'embedding_model': self.embedding_model_name,
             'collection_name': self.collection_name
         }
+        self._stats_cache = (stats, time.monotonic())
+        return dict(stats)
     
     def delete_collection(self):
         """Delete the entire collection"""
         self.client.delete_collection(self.collection_name)
+        self._stats_cache = None
         print(f"Deleted collection: {self.collection_name}")
 
 
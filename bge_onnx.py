@@ -0,0 +1,149 @@
+"""
+ONNX Runtime encoder for the BGE embedding model
+Drop-in replacement for SentenceTransformer.encode used by knowledge_base.py.
+
+Export (and int8-quantize) the model once with:
+    python -m bge_onnx [output_dir]
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+except ImportError:
+    ort = None
+    AutoTokenizer = None
+
+EMBEDDING_MODEL = "BAAI/bge-large-en-v1.5"
+DEFAULT_MODEL_DIR = Path(__file__).parent / "models" / "bge-large-onnx"
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+
+
+def onnx_model_available(model_dir: Union[str, Path] = DEFAULT_MODEL_DIR) -> bool:
+    """True when onnxruntime is installed and an exported model is on disk"""
+    model_dir = Path(model_dir)
+    return ort is not None and (
+        (model_dir / QUANTIZED_MODEL_FILE).exists() or (model_dir / MODEL_FILE).exists()
+    )
+
+
+class BGEOnnxEncoder:
+    """BGE embeddings via ONNX Runtime (CLS pooling + L2 norm, as sentence-transformers does)"""
+
+    def __init__(self, model_dir: Union[str, Path] = DEFAULT_MODEL_DIR, max_length: int = 512):
+        if ort is None:
+            raise ImportError("onnxruntime and transformers are required for BGEOnnxEncoder")
+        model_dir = Path(model_dir)
+        model_path = model_dir / QUANTIZED_MODEL_FILE
+        if not model_path.exists():
+            model_path = model_dir / MODEL_FILE
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.max_length = max_length
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self._prefix_ids = {}
+
+    def encode(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = True,
+        prefix: str = "",
+        **kwargs,
+    ) -> np.ndarray:
+        """Embed texts; returns a (n, dim) float32 array (a 1-D vector for a single string).
+
+        prefix (e.g. a BGE instruction) is tokenized once and spliced in at
+        the token-id level rather than concatenated onto every text.
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            if prefix:
+                enc = self._tokenize_with_prefix(batch, prefix)
+            else:
+                # Pad only to the longest text in this batch
+                enc = self.tokenizer(
+                    batch,
+                    padding="longest",
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="np",
+                )
+            feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self._input_names}
+            if "token_type_ids" in self._input_names and "token_type_ids" not in feeds:
+                feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+            hidden = self.session.run(["last_hidden_state"], feeds)[0]
+            batches.append(hidden[:, 0])
+
+        if batches:
+            embeddings = np.vstack(batches).astype(np.float32, copy=False)
+        else:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True).clip(min=1e-12)
+        return embeddings[0] if single else embeddings
+
+    def _tokenize_with_prefix(self, texts: List[str], prefix: str):
+        """[CLS] + prefix ids + text ids + [SEP], truncated and padded to the batch's longest"""
+        prefix_ids = self._prefix_ids.get(prefix)
+        if prefix_ids is None:
+            prefix_ids = self.tokenizer(prefix, add_special_tokens=False)["input_ids"]
+            self._prefix_ids[prefix] = prefix_ids
+        room = self.max_length - len(prefix_ids) - 2
+        head = [self.tokenizer.cls_token_id] + prefix_ids
+        tail = [self.tokenizer.sep_token_id]
+        text_ids = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return self.tokenizer.pad(
+            {"input_ids": [head + ids[:room] + tail for ids in text_ids]},
+            padding="longest",
+            return_tensors="np",
+        )
+
+
+def export(
+    output_dir: Union[str, Path] = DEFAULT_MODEL_DIR,
+    model_name: str = EMBEDDING_MODEL,
+    quantize: bool = True,
+) -> Path:
+    """Export the model to ONNX (plus a dynamic int8 copy) with its tokenizer"""
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Exporting {model_name} to {output_dir}...")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    if quantize:
+        print("Quantizing weights to int8...")
+        quantize_dynamic(
+            str(output_dir / MODEL_FILE),
+            str(output_dir / QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+    print("Done.")
+    return output_dir
+
+
+if __name__ == "__main__":
+    export(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL_DIR)
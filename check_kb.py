@@ -4,10 +4,13 @@ import os
 def check():
     if os.path.exists("./chroma_db"):
         client = chromadb.PersistentClient(path="./chroma_db")
-        try:
-            collection = client.get_collection("seobot_knowledge")
-            print(f"seobot_knowledge (./chroma_db): {collection.count()}")
-        except Exception:
+        # Rebuilds create versioned collections (seobot_knowledge_<ms>)
+        names = [getattr(c, "name", c) for c in client.list_collections()]
+        names = [n for n in names if n.startswith("seobot_knowledge")]
+        if names:
+            for name in names:
+                print(f"{name} (./chroma_db): {client.get_collection(name).count()}")
+        else:
             print("seobot_knowledge not found in ./chroma_db")
     else:
         print("./chroma_db does not exist")
@@ -5,17 +5,219 @@ SEOBOT Code Rewriter - Automatically fixes SEO issues in website files
 import re
 import json
 import os
+import string
+from functools import lru_cache
 from pathlib import Path
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_SOURCE_EXTENSIONS = ('.html', '.tsx', '.jsx', '.vue')
+_SKIP_DIRS = frozenset({'node_modules', 'dist'})
+
+_HEAD_RE = re.compile(r'(<head(?:\s[^>]*)?>)(.*?)(</head>)', re.IGNORECASE | re.DOTALL)
+_TITLE_CLOSE_RE = re.compile(r'</title>', re.IGNORECASE)
+
+# Detection patterns below run against _ascii_lower(content), so they are
+# written in lowercase and compiled without re.IGNORECASE
+_TITLE_RE = re.compile(r'<title>(.*?)</title>')
+_DESC_RE = re.compile(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\'][^>]*>')
+_VIEWPORT_RE = re.compile(r'<meta[^>]*viewport')
+_CANONICAL_RE = re.compile(r'<link[^>]*canonical')
+_ROBOTS_RE = re.compile(r'<meta[^>]*robots')
+_OG_SCAN_RE = re.compile(r'<meta[^>]*property=["\'](og:[^"\']+)["\'][^>]*>')
+_TWITTER_SCAN_RE = re.compile(r'<meta[^>]*name=["\'](twitter:[^"\']+)["\'][^>]*>')
+
+# Unrolled "[^<]*(?:<(?!/script>)[^<]*)*" body: each character has exactly one
+# way to match, so unterminated scripts fail in linear time instead of backtracking
+_LDJSON_RE = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>[^<]*(?:<(?!/script>)[^<]*)*</script>',
+    re.IGNORECASE
+)
+
+_HTACCESS_TEMPLATE_BYTES = b"""
+# SEOBOT: Browser Caching for Performance
+<IfModule mod_expires.c>
+    ExpiresActive On
+    ExpiresByType image/jpg "access plus 1 year"
+    ExpiresByType image/jpeg "access plus 1 year"
+    ExpiresByType image/gif "access plus 1 year"
+    ExpiresByType image/png "access plus 1 year"
+    ExpiresByType image/webp "access plus 1 year"
+    ExpiresByType text/css "access plus 1 month"
+    ExpiresByType application/pdf "access plus 1 month"
+    ExpiresByType text/javascript "access plus 1 month"
+    ExpiresByType application/javascript "access plus 1 month"
+    ExpiresByType application/x-javascript "access plus 1 month"
+    ExpiresByType application/x-shockwave-flash "access plus 1 month"
+    ExpiresByType image/x-icon "access plus 1 year"
+    ExpiresDefault "access plus 2 days"
+</IfModule>
+
+# Enable compression
+<IfModule mod_deflate.c>
+    AddOutputFilterByType DEFLATE text/plain
+    AddOutputFilterByType DEFLATE text/html
+    AddOutputFilterByType DEFLATE text/xml
+    AddOutputFilterByType DEFLATE text/css
+    AddOutputFilterByType DEFLATE application/xml
+    AddOutputFilterByType DEFLATE application/xhtml+xml
+    AddOutputFilterByType DEFLATE application/rss+xml
+    AddOutputFilterByType DEFLATE application/javascript
+    AddOutputFilterByType DEFLATE application/x-javascript
+</IfModule>
+"""
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _ascii_lower(text: str) -> str:
+    """Lowercase text for searching while keeping offsets aligned with the original"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few non-ASCII characters change length when lowercased; markup is ASCII
+    return text.translate(_ASCII_LOWER)
+
+
+def _splice(content: str, edits: List[Tuple[int, int, str]]) -> str:
+    """Apply non-overlapping (start, end, replacement) edits with a single join"""
+    if not edits:
+        return content
+    parts = []
+    pos = 0
+    for start, end, text in sorted(edits):
+        parts.append(content[pos:start])
+        parts.append(text)
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+def _iter_source_files(root: Path):
+    """Yield rewritable source files under root in one walk, pruning build/backup dirs"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS and not d.startswith('.seobot')]
+        for filename in filenames:
+            if filename.endswith(_SOURCE_EXTENSIONS):
+                yield Path(dirpath) / filename
+
+
+@dataclass
+class _HeadPatches:
+    """Tags the fixers want inserted into <head>, applied in one pass by _apply_patches"""
+    title: Optional[str] = None
+    meta_description: Optional[str] = None
+    viewport: Optional[str] = None
+    canonical: Optional[str] = None
+    robots: Optional[str] = None
+    og_tags: List[str] = field(default_factory=list)
+    twitter_tags: List[str] = field(default_factory=list)
+    schema: Optional[str] = None
+
+
+def _apply_patches(content: str, patches: _HeadPatches) -> str:
+    """Splice all queued head tags into content with a single rewrite of <head>"""
+    after_title = [tag for tag in (patches.meta_description, patches.viewport,
+                                   patches.canonical, patches.robots) if tag]
+    before_close = patches.og_tags + patches.twitter_tags
+    if patches.schema:
+        before_close.append(patches.schema)
+    if not (patches.title or after_title or before_close):
+        return content
+
+    def splice(match):
+        head_open, head, head_close = match.groups()
+        meta_block = ''.join(f'\n    {tag}' for tag in after_title)
+        if patches.title:
+            head = f'\n    {patches.title}{meta_block}{head}'
+        elif meta_block:
+            title_close = _TITLE_CLOSE_RE.search(head)
+            pos = title_close.end() if title_close else 0
+            head = head[:pos] + meta_block + head[pos:]
+        tail = ''.join(f'    {tag}\n' for tag in before_close)
+        return head_open + head + tail + head_close
+
+    return _HEAD_RE.sub(splice, content, count=1)
+
+
+@lru_cache(maxsize=256)
+def _schema_json(schema_type: str, title: str, description: str, url: str, image: str,
+                 author: str, job_title: str, date_published: Optional[str],
+                 date_modified: Optional[str], social_links: Tuple[str, ...],
+                 pretty: bool = False) -> str:
+    """Serialize a Schema.org JSON-LD block; memoized since most pages share a shape"""
+    schema = {
+        "@context": "https://schema.org",
+        "@type": schema_type,
+        "name": title,
+        "description": description,
+        "url": url
+    }
+    
+    if schema_type == 'Organization':
+        schema.update({
+            "logo": f"{url}/logo.png",
+            "sameAs": list(social_links),
+            "contactPoint": {
+                "@type": "ContactPoint",
+                "contactType": "customer service"
+            }
+        })
+    
+    elif schema_type == 'Person':
+        schema.update({
+            "jobTitle": job_title,
+            "sameAs": list(social_links)
+        })
+    
+    elif schema_type == 'Article':
+        schema.update({
+            "author": {
+                "@type": "Person",
+                "name": author
+            },
+            "datePublished": date_published,
+            "dateModified": date_modified,
+            "image": image
+        })
+    
+    elif schema_type == 'LocalBusiness':
+        schema.update({
+            "address": {
+                "@type": "PostalAddress",
+                "addressRegion": "WV",
+                "addressCountry": "US"
+            },
+            "geo": {
+                "@type": "GeoCoordinates",
+                "latitude": "",
+                "longitude": ""
+            },
+            "openingHours": ["Mo-Fr 09:00-17:00"],
+            "priceRange": "$$"
+        })
+    
+    if orjson is not None:
+        return orjson.dumps(schema, option=orjson.OPT_INDENT_2 if pretty else 0).decode('utf-8')
+    if pretty:
+        return json.dumps(schema, indent=2)
+    return json.dumps(schema, separators=(',', ':'))
+
+
 class SEOCodeRewriter:
     """Rewrites website code to fix SEO issues based on the 3 SEO Laws"""
     
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, pretty_schema: bool = False):
         self.project_path = Path(project_path)
         self.changes_made = []
         self.backup_created = False
+        self.pretty_schema = pretty_schema
         
     def create_backup(self) -> str:
         """Create a backup of the original files"""
@@ -23,23 +225,26 @@ class SEOCodeRewriter:
         backup_dir.mkdir(exist_ok=True)
         
         # Backup HTML, TSX, JSX files
-        for ext in ['*.html', '*.tsx', '*.jsx', '*.vue']:
-            for file in self.project_path.rglob(ext):
-                if 'node_modules' not in str(file) and 'dist' not in str(file):
-                    relative = file.relative_to(self.project_path)
-                    backup_file = backup_dir / relative
-                    backup_file.parent.mkdir(parents=True, exist_ok=True)
-                    backup_file.write_text(file.read_text(encoding='utf-8'), encoding='utf-8')
+        for file in _iter_source_files(self.project_path):
+            relative = file.relative_to(self.project_path)
+            backup_file = backup_dir / relative
+            backup_file.parent.mkdir(parents=True, exist_ok=True)
+            backup_file.write_text(file.read_text(encoding='utf-8'), encoding='utf-8')
         
         self.backup_created = True
         return str(backup_dir)
     
-    def fix_meta_tags(self, content: str, page_data: Dict) -> Tuple[str, List[str]]:
+    def fix_meta_tags(self, content: str, page_data: Dict,
+                      patches: Optional[_HeadPatches] = None) -> Tuple[str, List[str]]:
         """Fix meta tags according to SEO Laws (50-60 char titles, 150-160 char descriptions)"""
         changes = []
+        pending = patches if patches is not None else _HeadPatches()
+        
+        lowered = _ascii_lower(content)
+        edits = []
         
         # Extract or create title
-        title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE)
+        title_match = _TITLE_RE.search(lowered)
         new_title = page_data.get('title', '')
         
         # Ensure title is 50-60 chars
@@ -49,13 +254,13 @@ class SEOCodeRewriter:
             new_title = new_title[:57] + "..."
             
         if title_match:
-            old_title = title_match.group(1)
+            old_title = content[title_match.start(1):title_match.end(1)]
             if old_title != new_title:
-                content = content.replace(f'<title>{old_title}</title>', f'<title>{new_title}</title>')
+                edits.append((title_match.start(1), title_match.end(1), new_title))
                 changes.append(f"Title: '{old_title}' → '{new_title}' ({len(new_title)} chars)")
         else:
             # Insert title after <head>
-            content = re.sub(r'(<head[^>]*>)', r'\1\n    <title>' + new_title + '</title>', content, flags=re.IGNORECASE)
+            pending.title = f'<title>{new_title}</title>'
             changes.append(f"Added title: '{new_title}' ({len(new_title)} chars)")
         
         # Fix or add meta description
@@ -67,40 +272,46 @@ class SEOCodeRewriter:
         if len(desc) > 160:
             desc = desc[:157] + "..."
             
-        desc_pattern = r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\'][^>]*>'
-        desc_match = re.search(desc_pattern, content, re.IGNORECASE)
+        desc_matches = list(_DESC_RE.finditer(lowered))
         
-        if desc_match:
-            old_desc = desc_match.group(1)
+        if desc_matches:
+            first = desc_matches[0]
+            old_desc = content[first.start(1):first.end(1)]
             if old_desc != desc:
-                content = re.sub(desc_pattern, f'<meta name="description" content="{desc}">', content, flags=re.IGNORECASE)
+                desc_tag = f'<meta name="description" content="{desc}">'
+                edits.extend((m.start(), m.end(), desc_tag) for m in desc_matches)
                 changes.append(f"Description updated ({len(desc)} chars)")
         else:
             # Add meta description after title
-            content = re.sub(r'(</title>)', r'\1\n    <meta name="description" content="' + desc + '">', content, flags=re.IGNORECASE)
+            pending.meta_description = f'<meta name="description" content="{desc}">'
             changes.append(f"Added description ({len(desc)} chars)")
         
         # Add viewport if missing
-        if not re.search(r'<meta[^>]*viewport', content, re.IGNORECASE):
-            content = re.sub(r'(</title>)', r'\1\n    <meta name="viewport" content="width=device-width, initial-scale=1.0">', content, flags=re.IGNORECASE)
+        if not _VIEWPORT_RE.search(lowered):
+            pending.viewport = '<meta name="viewport" content="width=device-width, initial-scale=1.0">'
             changes.append("Added viewport meta tag")
         
         # Add canonical if missing
         canonical_url = page_data.get('canonical', '')
-        if canonical_url and not re.search(r'<link[^>]*canonical', content, re.IGNORECASE):
-            content = re.sub(r'(</title>)', r'\1\n    <link rel="canonical" href="' + canonical_url + '">', content, flags=re.IGNORECASE)
+        if canonical_url and not _CANONICAL_RE.search(lowered):
+            pending.canonical = f'<link rel="canonical" href="{canonical_url}">'
             changes.append(f"Added canonical: {canonical_url}")
         
         # Add robots if missing
-        if not re.search(r'<meta[^>]*robots', content, re.IGNORECASE):
-            content = re.sub(r'(</title>)', r'\1\n    <meta name="robots" content="index, follow">', content, flags=re.IGNORECASE)
+        if not _ROBOTS_RE.search(lowered):
+            pending.robots = '<meta name="robots" content="index, follow">'
             changes.append("Added robots meta tag")
         
+        content = _splice(content, edits)
+        if patches is None:
+            content = _apply_patches(content, pending)
         return content, changes
     
-    def fix_open_graph(self, content: str, page_data: Dict) -> Tuple[str, List[str]]:
+    def fix_open_graph(self, content: str, page_data: Dict,
+                       patches: Optional[_HeadPatches] = None) -> Tuple[str, List[str]]:
         """Add/fix Open Graph tags"""
         changes = []
+        pending = patches if patches is not None else _HeadPatches()
         
         og_tags = {
             'og:type': 'website',
@@ -110,22 +321,33 @@ class SEOCodeRewriter:
             'og:image': page_data.get('image', f"{page_data.get('url', '')}/og-image.jpg")
         }
         
+        # One pass to learn which OG tags the page already has, and where
+        present = {}
+        for m in _OG_SCAN_RE.finditer(_ascii_lower(content)):
+            present.setdefault(m.group(1), []).append(m.span())
+        
+        edits = []
         for property_name, content_value in og_tags.items():
-            pattern = rf'<meta[^>]*property=["\']{property_name}["\'][^>]*>'
             tag = f'<meta property="{property_name}" content="{content_value}">'
+            spans = present.get(property_name)
             
-            if re.search(pattern, content, re.IGNORECASE):
-                content = re.sub(pattern, tag, content, flags=re.IGNORECASE)
+            if spans:
+                edits.extend((start, end, tag) for start, end in spans if content[start:end] != tag)
             else:
                 # Add before </head>
-                content = re.sub(r'(</head>)', f'    {tag}\n\1', content, flags=re.IGNORECASE)
+                pending.og_tags.append(tag)
                 changes.append(f"Added {property_name}")
         
+        content = _splice(content, edits)
+        if patches is None:
+            content = _apply_patches(content, pending)
         return content, changes
     
-    def fix_twitter_cards(self, content: str, page_data: Dict) -> Tuple[str, List[str]]:
+    def fix_twitter_cards(self, content: str, page_data: Dict,
+                          patches: Optional[_HeadPatches] = None) -> Tuple[str, List[str]]:
         """Add/fix Twitter Card tags"""
         changes = []
+        pending = patches if patches is not None else _HeadPatches()
         
         twitter_tags = {
             'twitter:card': 'summary_large_image',
@@ -135,95 +357,67 @@ class SEOCodeRewriter:
             'twitter:image': page_data.get('image', f"{page_data.get('url', '')}/twitter-image.jpg")
         }
         
+        present = {}
+        for m in _TWITTER_SCAN_RE.finditer(_ascii_lower(content)):
+            present.setdefault(m.group(1), []).append(m.span())
+        
+        edits = []
         for name, content_value in twitter_tags.items():
-            pattern = rf'<meta[^>]*name=["\']{name}["\'][^>]*>'
             tag = f'<meta name="{name}" content="{content_value}">'
+            spans = present.get(name)
             
-            if re.search(pattern, content, re.IGNORECASE):
-                content = re.sub(pattern, tag, content, flags=re.IGNORECASE)
+            if spans:
+                edits.extend((start, end, tag) for start, end in spans if content[start:end] != tag)
             else:
-                content = re.sub(r'(</head>)', f'    {tag}\n\1', content, flags=re.IGNORECASE)
+                pending.twitter_tags.append(tag)
                 changes.append(f"Added {name}")
         
+        content = _splice(content, edits)
+        if patches is None:
+            content = _apply_patches(content, pending)
         return content, changes
     
     def generate_schema_markup(self, page_data: Dict) -> str:
         """Generate Schema.org JSON-LD markup"""
         schema_type = page_data.get('schema_type', 'WebPage')
-        
-        schema = {
-            "@context": "https://schema.org",
-            "@type": schema_type,
-            "name": page_data.get('title', ''),
-            "description": page_data.get('description', ''),
-            "url": page_data.get('url', '')
-        }
-        
-        if schema_type == 'Organization':
-            schema.update({
-                "logo": f"{page_data.get('url', '')}/logo.png",
-                "sameAs": page_data.get('social_links', []),
-                "contactPoint": {
-                    "@type": "ContactPoint",
-                    "contactType": "customer service"
-                }
-            })
-        
-        elif schema_type == 'Person':
-            schema.update({
-                "jobTitle": page_data.get('job_title', 'Web Designer'),
-                "sameAs": page_data.get('social_links', [])
-            })
-        
-        elif schema_type == 'Article':
-            schema.update({
-                "author": {
-                    "@type": "Person",
-                    "name": page_data.get('author', 'Adaryus')
-                },
-                "datePublished": page_data.get('date_published', datetime.now().isoformat()),
-                "dateModified": page_data.get('date_modified', datetime.now().isoformat()),
-                "image": page_data.get('image', '')
-            })
-        
-        elif schema_type == 'LocalBusiness':
-            schema.update({
-                "address": {
-                    "@type": "PostalAddress",
-                    "addressRegion": "WV",
-                    "addressCountry": "US"
-                },
-                "geo": {
-                    "@type": "GeoCoordinates",
-                    "latitude": "",
-                    "longitude": ""
-                },
-                "openingHours": ["Mo-Fr 09:00-17:00"],
-                "priceRange": "$$"
-            })
-        
-        return json.dumps(schema, indent=2)
+        date_published = date_modified = None
+        if schema_type == 'Article':
+            now = datetime.now().isoformat()
+            date_published = page_data.get('date_published', now)
+            date_modified = page_data.get('date_modified', now)
+        
+        return _schema_json(
+            schema_type,
+            page_data.get('title', ''),
+            page_data.get('description', ''),
+            page_data.get('url', ''),
+            page_data.get('image', ''),
+            page_data.get('author', 'Adaryus'),
+            page_data.get('job_title', 'Web Designer'),
+            date_published,
+            date_modified,
+            tuple(page_data.get('social_links', [])),
+            self.pretty_schema
+        )
     
-    def fix_schema_markup(self, content: str, page_data: Dict) -> Tuple[str, List[str]]:
+    def fix_schema_markup(self, content: str, page_data: Dict,
+                          patches: Optional[_HeadPatches] = None) -> Tuple[str, List[str]]:
         """Add/fix Schema.org markup"""
         changes = []
         
         schema_json = self.generate_schema_markup(page_data)
         schema_script = f'<script type="application/ld+json">\n{schema_json}\n</script>'
         
-        # Check if schema already exists
-        if re.search(r'<script[^>]*type=["\']application/ld+json["\']', content, re.IGNORECASE):
-            # Replace existing
-            content = re.sub(
-                r'<script[^>]*type=["\']application/ld+json["\'][^>]*>.*?</script>',
-                schema_script,
-                content,
-                flags=re.IGNORECASE | re.DOTALL
-            )
+        # Replace existing schema, if any
+        content, replaced = _LDJSON_RE.subn(lambda m: schema_script, content)
+        if replaced:
             changes.append(f"Updated {page_data.get('schema_type', 'WebPage')} schema")
         else:
             # Add new
-            content = re.sub(r'(</head>)', f'    {schema_script}\n\1', content, flags=re.IGNORECASE)
+            if patches is None:
+                content = _apply_patches(content, _HeadPatches(schema=schema_script))
+            else:
+                patches.schema = schema_script
             changes.append(f"Added {page_data.get('schema_type', 'WebPage')} schema markup")
         
         return content, changes
@@ -282,47 +476,14 @@ class SEOCodeRewriter:
         """Generate .htaccess rules for browser caching"""
         changes = []
         
-        htaccess_content = """
-# SEOBOT: Browser Caching for Performance
-<IfModule mod_expires.c>
-    ExpiresActive On
-    ExpiresByType image/jpg "access plus 1 year"
-    ExpiresByType image/jpeg "access plus 1 year"
-    ExpiresByType image/gif "access plus 1 year"
-    ExpiresByType image/png "access plus 1 year"
-    ExpiresByType image/webp "access plus 1 year"
-    ExpiresByType text/css "access plus 1 month"
-    ExpiresByType application/pdf "access plus 1 month"
-    ExpiresByType text/javascript "access plus 1 month"
-    ExpiresByType application/javascript "access plus 1 month"
-    ExpiresByType application/x-javascript "access plus 1 month"
-    ExpiresByType application/x-shockwave-flash "access plus 1 month"
-    ExpiresByType image/x-icon "access plus 1 year"
-    ExpiresDefault "access plus 2 days"
-</IfModule>
-
-# Enable compression
-<IfModule mod_deflate.c>
-    AddOutputFilterByType DEFLATE text/plain
-    AddOutputFilterByType DEFLATE text/html
-    AddOutputFilterByType DEFLATE text/xml
-    AddOutputFilterByType DEFLATE text/css
-    AddOutputFilterByType DEFLATE application/xml
-    AddOutputFilterByType DEFLATE application/xhtml+xml
-    AddOutputFilterByType DEFLATE application/rss+xml
-    AddOutputFilterByType DEFLATE application/javascript
-    AddOutputFilterByType DEFLATE application/x-javascript
-</IfModule>
-"""
-        
         htaccess_file = htaccess_path / ".htaccess"
         if htaccess_file.exists():
-            existing = htaccess_file.read_text()
-            if "SEOBOT" not in existing:
-                htaccess_file.write_text(existing + htaccess_content)
+            existing = htaccess_file.read_bytes()
+            if b"SEOBOT" not in existing:
+                htaccess_file.write_bytes(existing + _HTACCESS_TEMPLATE_BYTES)
                 changes.append("Updated .htaccess with caching rules")
         else:
-            htaccess_file.write_text(htaccess_content)
+            htaccess_file.write_bytes(_HTACCESS_TEMPLATE_BYTES)
             changes.append("Created .htaccess with caching rules")
         
         return changes
@@ -338,31 +499,39 @@ class SEOCodeRewriter:
         
         try:
             content = file_path.read_text(encoding='utf-8')
+            original = content
             all_changes = []
             
-            # Apply all fixes
-            content, changes = self.fix_meta_tags(content, page_data)
+            # Apply all fixes; new <head> tags are queued and spliced in once
+            patches = _HeadPatches()
+            content, changes = self.fix_meta_tags(content, page_data, patches)
             all_changes.extend(changes)
             
-            content, changes = self.fix_open_graph(content, page_data)
+            content, changes = self.fix_open_graph(content, page_data, patches)
             all_changes.extend(changes)
             
-            content, changes = self.fix_twitter_cards(content, page_data)
+            content, changes = self.fix_twitter_cards(content, page_data, patches)
             all_changes.extend(changes)
             
-            content, changes = self.fix_schema_markup(content, page_data)
+            content, changes = self.fix_schema_markup(content, page_data, patches)
             all_changes.extend(changes)
             
+            content = _apply_patches(content, patches)
+            
             content, changes = self.fix_image_alt_text(content)
             all_changes.extend(changes)
             
             content, changes = self.add_webgl_optimizations(content)
             all_changes.extend(changes)
             
+            result['success'] = True
+            
+            # Already up to date (e.g. a re-run): leave the file untouched
+            if content == original:
+                return result
+            
             # Write back
             file_path.write_text(content, encoding='utf-8')
-            
-            result['success'] = True
             result['changes'] = all_changes
             
         except Exception as e:
@@ -378,25 +547,21 @@ class SEOCodeRewriter:
         backup_path = self.create_backup()
         
         # Find all HTML/TSX/JSX files
-        for ext in ['*.html', '*.tsx', '*.jsx', '*.vue']:
-            for file in self.project_path.rglob(ext):
-                if 'node_modules' in str(file) or 'dist' in str(file) or '.seobot' in str(file):
-                    continue
-                
-                # Determine page data based on filename
-                page_name = file.stem
-                page_data = {
-                    'title': f"{project_data['name']} - {page_name.title()}",
-                    'description': project_data['description'],
-                    'site_name': project_data['name'],
-                    'url': f"https://{project_data['domain']}/{page_name}",
-                    'canonical': f"https://{project_data['domain']}/{page_name}",
-                    'schema_type': project_data.get('schema_type', 'WebPage'),
-                    'social_links': project_data.get('social_links', [])
-                }
-                
-                result = self.rewrite_file(file, page_data)
-                results.append(result)
+        for file in _iter_source_files(self.project_path):
+            # Determine page data based on filename
+            page_name = file.stem
+            page_data = {
+                'title': f"{project_data['name']} - {page_name.title()}",
+                'description': project_data['description'],
+                'site_name': project_data['name'],
+                'url': f"https://{project_data['domain']}/{page_name}",
+                'canonical': f"https://{project_data['domain']}/{page_name}",
+                'schema_type': project_data.get('schema_type', 'WebPage'),
+                'social_links': project_data.get('social_links', [])
+            }
+            
+            result = self.rewrite_file(file, page_data)
+            results.append(result)
         
         # Add .htaccess for caching
         htaccess_changes = self.add_browser_caching_headers(self.project_path)
@@ -0,0 +1,210 @@
+"""
+Embedding micro-service for SEOBOT
+Keeps the BGE model loaded in one long-lived process so CLI runs don't pay
+the model load each time. Start it with:
+    python embed_server.py [--port 8765]
+or set SEOBOT_EMBED_SERVER=1 and the knowledge base spawns it on first use.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import requests
+
+EMBED_HOST = "127.0.0.1"
+EMBED_PORT = int(os.environ.get("SEOBOT_EMBED_PORT", "8765"))
+EMBEDDING_MODEL = "BAAI/bge-large-en-v1.5"
+# Seconds to wait for a spawned server to load the model and answer
+STARTUP_TIMEOUT = 180
+# Texts per HTTP request, so bulk encodes don't build one huge JSON body
+REQUEST_BATCH = 256
+# Server-side micro-batching: texts from concurrent requests share one
+# forward pass of up to MAX_BATCH, waiting at most MAX_WAIT seconds to fill it
+MAX_BATCH = 32
+MAX_WAIT = 0.005
+
+
+def load_model():
+    """The BGE encoder: ONNX export if present, else sentence-transformers"""
+    from bge_onnx import BGEOnnxEncoder, onnx_model_available
+    if onnx_model_available():
+        return BGEOnnxEncoder()
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+async def _batch_loop(model, queue: asyncio.Queue):
+    """Collect (text, normalize, future) items into batches and encode each
+    batch once, off the event loop"""
+    loop = asyncio.get_running_loop()
+    while True:
+        items = [await queue.get()]
+        deadline = loop.time() + MAX_WAIT
+        while len(items) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        texts = [text for text, _, _ in items]
+        try:
+            embeddings = await loop.run_in_executor(
+                None,
+                lambda: np.asarray(
+                    model.encode(texts, batch_size=MAX_BATCH, show_progress_bar=False),
+                    dtype=np.float32,
+                ),
+            )
+        except Exception as e:
+            for _, _, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            continue
+
+        # Requests may differ in wanting unit vectors, so normalise per item
+        for (_, normalize, fut), emb in zip(items, embeddings):
+            if normalize:
+                emb = emb / max(float(np.linalg.norm(emb)), 1e-12)
+            if not fut.done():
+                fut.set_result(emb)
+
+
+def create_app(model):
+    """FastAPI app exposing GET /health and POST /embed"""
+    from fastapi import FastAPI
+    from pydantic import BaseModel
+
+    class EmbedRequest(BaseModel):
+        texts: List[str]
+        normalize: bool = False
+        batch_size: int = 32  # accepted for compatibility; batching is server-side
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.queue = asyncio.Queue()
+        task = asyncio.create_task(_batch_loop(model, app.state.queue))
+        yield
+        task.cancel()
+
+    app = FastAPI(title="SEOBOT embedder", lifespan=lifespan)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "model": EMBEDDING_MODEL}
+
+    @app.post("/embed")
+    async def embed(req: EmbedRequest):
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in req.texts:
+            fut = loop.create_future()
+            await app.state.queue.put((text, req.normalize, fut))
+            futures.append(fut)
+        embeddings = await asyncio.gather(*futures)
+        return {"embeddings": [emb.tolist() for emb in embeddings]}
+
+    return app
+
+
+class EmbedderClient:
+    """Drop-in for SentenceTransformer.encode backed by the embedding server"""
+
+    def __init__(self, host: str = EMBED_HOST, port: int = EMBED_PORT):
+        self.url = f"http://{host}:{port}"
+        self.session = requests.Session()
+
+    def healthy(self) -> bool:
+        try:
+            return self.session.get(self.url + "/health", timeout=1).ok
+        except requests.RequestException:
+            return False
+
+    def encode(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        parts = []
+        for start in range(0, len(texts), REQUEST_BATCH):
+            resp = self.session.post(
+                self.url + "/embed",
+                json={
+                    "texts": texts[start:start + REQUEST_BATCH],
+                    "normalize": normalize_embeddings,
+                    "batch_size": batch_size,
+                },
+                timeout=600,
+            )
+            resp.raise_for_status()
+            parts.append(np.asarray(resp.json()["embeddings"], dtype=np.float32))
+
+        embeddings = np.vstack(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+def connect_embedder(spawn: Optional[bool] = None) -> Optional[EmbedderClient]:
+    """Client for a running embedding server, or None if there isn't one.
+
+    With spawn (default: SEOBOT_EMBED_SERVER=1) a missing server is started
+    in the background and waited for.
+    """
+    client = EmbedderClient()
+    if client.healthy():
+        return client
+
+    if spawn is None:
+        spawn = os.environ.get("SEOBOT_EMBED_SERVER") == "1"
+    if not spawn:
+        return None
+    try:
+        import fastapi  # noqa: F401
+        import uvicorn  # noqa: F401
+    except ImportError:
+        return None
+
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "--port", str(EMBED_PORT)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if client.healthy():
+            return client
+        time.sleep(0.5)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SEOBOT embedding server")
+    parser.add_argument("--host", default=EMBED_HOST)
+    parser.add_argument("--port", type=int, default=EMBED_PORT)
+    args = parser.parse_args()
+
+    import uvicorn
+    print(f"Loading {EMBEDDING_MODEL}...")
+    app = create_app(load_model())
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
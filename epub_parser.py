@@ -6,84 +6,260 @@ Extracts and processes content from EPUB files for knowledge base
 import warnings
 warnings.filterwarnings('ignore')
 
-import ebooklib
-from ebooklib import epub
-from bs4 import BeautifulSoup
+from lxml import etree
+import os
+import posixpath
+import zipfile
 import re
 import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Iterable, Iterator, Tuple
+from urllib.parse import unquote
 import hashlib
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+SEO_KEYWORDS = (
+    'meta tag', 'schema.org', 'structured data', 'json-ld', 'rich snippet',
+    'open graph', 'twitter card', 'canonical', 'robots.txt', 'sitemap',
+    'keyword research', 'backlink', 'domain authority', 'page rank',
+    'on-page seo', 'off-page seo', 'technical seo', 'local seo',
+    'content optimization', 'title tag', 'meta description', 'header tag',
+    'alt text', 'internal linking', 'url structure', 'site speed',
+    'mobile optimization', 'core web vitals', 'lighthouse',
+    'google search console', 'google analytics', 'ranking factor',
+    'search intent', 'semantic search', 'voice search', 'featured snippet'
+)
+
+# Paragraphs mentioning any of these are kept even without an SEO keyword hit
+SEO_TRIGGER_WORDS = ('seo', 'search engine', 'google', 'ranking')
+
+CATEGORY_KEYWORDS = {
+    'meta_tags': ('meta tag', 'meta description', 'title tag', 'viewport'),
+    'structured_data': ('schema.org', 'structured data', 'json-ld', 'microdata', 'rich snippet'),
+    'technical_seo': ('robots.txt', 'sitemap', 'canonical', 'redirect', 'crawl', 'index'),
+    'on_page': ('content optimization', 'keyword density', 'header tag', 'h1', 'h2', 'alt text'),
+    'off_page': ('backlink', 'link building', 'guest post', 'social signal'),
+    'local_seo': ('google business', 'local pack', 'citation', 'nap'),
+    'analytics': ('google analytics', 'search console', 'tracking', 'conversion'),
+    'performance': ('site speed', 'core web vitals', 'lighthouse', 'page speed')
+}
+
+# Set views so per-paragraph scoring is a C-level intersection with the
+# matched keywords rather than a Python loop over every keyword
+_SEO_KEYWORD_SET = frozenset(SEO_KEYWORDS)
+_TRIGGER_WORD_SET = frozenset(SEO_TRIGGER_WORDS)
+_CATEGORY_KEYWORD_SETS = {cat: frozenset(kws) for cat, kws in CATEGORY_KEYWORDS.items()}
+# (category, keywords, largest score any later category could still reach)
+_CATEGORY_BOUNDS = tuple(
+    (cat, kws, max((len(k) for k in list(_CATEGORY_KEYWORD_SETS.values())[i + 1:]), default=0))
+    for i, (cat, kws) in enumerate(_CATEGORY_KEYWORD_SETS.items())
+)
+_ALL_KEYWORDS = tuple(dict.fromkeys(
+    SEO_KEYWORDS + SEO_TRIGGER_WORDS
+    + tuple(kw for kws in CATEGORY_KEYWORDS.values() for kw in kws)
+))
+
+_WORD_RE = re.compile(r'\S+')
+_CLEAN_RE = re.compile(r'(\n)\n+|( ) +|[^\w\s.,;:!?()-]+')
+
+
+def _clean_repl(match) -> str:
+    return match.group(1) or match.group(2) or ''
+
+
+# Parsed books are cached here (relative to the scanned directory); bump
+# _CACHE_VERSION whenever parsing or chunking output changes
+CACHE_DIR = '.epub_cache'
+_CACHE_VERSION = 'v3'
+
+# recover=True matches BeautifulSoup's tolerance of broken chapter markup
+_HTML_PARSER = etree.HTMLParser(recover=True, encoding='utf-8')
+
+
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, recover=True)
+_CONTAINER_NS = 'urn:oasis:names:tc:opendocument:xmlns:container'
+_OPF_NS = 'http://www.idpf.org/2007/opf'
+_DC_NS = 'http://purl.org/dc/elements/1.1/'
+_DOCUMENT_TYPES = frozenset({'application/xhtml+xml', 'text/html'})
+
+
+class _EPUBDocument:
+    """One spine document, read from the zip only when its content is asked for"""
+    __slots__ = ('_zf', '_path', '_id', '_name')
+    
+    def __init__(self, zf: zipfile.ZipFile, path: str, item_id: str, name: str):
+        self._zf = zf
+        self._path = path
+        self._id = item_id
+        self._name = name
+    
+    def get_content(self) -> bytes:
+        with self._zf.open(self._path) as fh:
+            return fh.read()
+    
+    def get_id(self) -> str:
+        return self._id
+    
+    def get_name(self) -> str:
+        return self._name
+
+
+class _EPUBPackage:
+    """Metadata and spine of an open EPUB, parsed from its OPF without loading any documents"""
+    
+    def __init__(self, zf: zipfile.ZipFile):
+        container = etree.fromstring(zf.read('META-INF/container.xml'), _XML_PARSER)
+        opf_path = container.find(f'.//{{{_CONTAINER_NS}}}rootfile').get('full-path')
+        opf = etree.fromstring(zf.read(opf_path), _XML_PARSER)
+        base = posixpath.dirname(opf_path)
+        
+        self.metadata = {}
+        for name in ('title', 'creator', 'language', 'identifier'):
+            el = opf.find(f'.//{{{_DC_NS}}}{name}')
+            if el is not None and el.text:
+                self.metadata[name] = el.text
+        
+        manifest = {item.get('id'): item for item in opf.iter(f'{{{_OPF_NS}}}item')}
+        self.documents = []
+        for ref in opf.iter(f'{{{_OPF_NS}}}itemref'):
+            item = manifest.get(ref.get('idref'))
+            if item is None or item.get('media-type') not in _DOCUMENT_TYPES:
+                continue
+            href = unquote(item.get('href', '').split('#', 1)[0])
+            path = posixpath.normpath(posixpath.join(base, href))
+            self.documents.append(_EPUBDocument(zf, path, item.get('id'), href))
+
+
+def _path_id(filepath: str) -> str:
+    """Short id for a file path. Always md5: book_id, and every chunk_id
+    built from it, is persisted, so it must not change with installed packages"""
+    return hashlib.md5(filepath.encode()).hexdigest()[:12]
+
+
+def _paragraphs(text: str) -> List[str]:
+    """Stripped lines of text long enough to stand alone as a paragraph"""
+    return [p for p in (line.strip() for line in text.split('\n')) if len(p) > 50]
+
+
+def _window_bounds(n_words: int, chunk_size: int, overlap: int):
+    """Yield (first, end) word indices of overlapping windows covering n_words"""
+    step = max(1, chunk_size - overlap)
+    start = 0
+    while start < n_words:
+        end = min(start + chunk_size, n_words)
+        yield start, end
+        if end == n_words:
+            break
+        start += step
+
+
+def _window_count(n_words: int, chunk_size: int, overlap: int) -> int:
+    """Number of windows _window_bounds yields, in closed form"""
+    if n_words <= 0:
+        return 0
+    step = max(1, chunk_size - overlap)
+    return 1 + max(0, -(-(n_words - chunk_size) // step))
+
 
 class EPUBParser:
     """Parse EPUB files and extract structured content"""
     
     def __init__(self):
         self.books = []
+        # One automaton finds every keyword in a single pass over the text
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for kw in _ALL_KEYWORDS:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+    
+    def _match_keywords(self, text: str) -> Set[str]:
+        """Return the set of known keywords occurring (as substrings) in lowercase text"""
+        if self._automaton is not None:
+            return {kw for _, kw in self._automaton.iter(text)}
+        return {kw for kw in _ALL_KEYWORDS if kw in text}
     
     def parse_epub(self, filepath: str) -> Dict[str, Any]:
         """Parse a single EPUB file and extract all relevant content"""
-        book = epub.read_epub(filepath)
-        
-        book_data = {
+        with zipfile.ZipFile(filepath) as zf:
+            book = _EPUBPackage(zf)
+            book_data = self._book_info(book, filepath)
+            book_data['chapters'] = list(self.iter_chapters(filepath, book))
+        return book_data
+    
+    def iter_chapters(self, filepath: str, book: Optional[_EPUBPackage] = None) -> Iterator[Dict[str, Any]]:
+        """Yield parsed chapters one at a time in spine order, reading each
+        document from the zip only when it is reached"""
+        if book is None:
+            with zipfile.ZipFile(filepath) as zf:
+                yield from self.iter_chapters(filepath, _EPUBPackage(zf))
+            return
+        for item in book.documents:
+            chapter = self._parse_chapter(item)
+            if chapter and len(chapter['content']) > 100:
+                yield chapter
+    
+    def _book_info(self, book: _EPUBPackage, filepath: str) -> Dict[str, Any]:
+        """Book-level metadata shared by every chapter and chunk"""
+        return {
             'title': self._get_metadata(book, 'title'),
             'author': self._get_metadata(book, 'creator'),
             'language': self._get_metadata(book, 'language'),
             'identifier': self._get_metadata(book, 'identifier'),
-            'chapters': [],
             'filepath': filepath,
-            'book_id': hashlib.md5(filepath.encode()).hexdigest()[:12]
+            'book_id': _path_id(filepath)
         }
-        
-        # Extract chapters
-        for item in book.get_items():
-            if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                chapter = self._parse_chapter(item)
-                if chapter and len(chapter['content']) > 100:
-                    book_data['chapters'].append(chapter)
-        
-        return book_data
     
-    def _get_metadata(self, book, name: str) -> str:
-        """Safely get metadata from EPUB"""
-        try:
-            data = book.get_metadata('DC', name)
-            return data[0][0] if data else 'Unknown'
-        except:
-            return 'Unknown'
+    def _get_metadata(self, book: _EPUBPackage, name: str) -> str:
+        """Safely get Dublin Core metadata from the EPUB package"""
+        return book.metadata.get(name, 'Unknown')
     
     def _parse_chapter(self, item) -> Optional[Dict[str, Any]]:
         """Parse a single chapter/document item"""
         try:
             content = item.get_content().decode('utf-8', errors='ignore')
-            soup = BeautifulSoup(content, 'html.parser')
+            # Re-encoding the decoded text guarantees valid UTF-8 for libxml2
+            root = etree.fromstring(content.encode('utf-8'), _HTML_PARSER)
+            if root is None:
+                return None
             
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            # Remove script and style elements (keeping the text after them)
+            # and comments
+            etree.strip_elements(root, 'script', 'style', etree.Comment, with_tail=False)
             
             # Get title
             title = ''
-            h1 = soup.find('h1')
-            if h1:
-                title = h1.get_text(strip=True)
+            h1 = next(root.iter('h1'), None)
+            if h1 is not None:
+                title = ''.join(t.strip() for t in h1.itertext())
             else:
                 # Try to get from file name
                 title = item.get_name().split('/')[-1].replace('.html', '').replace('.xhtml', '').replace('_', ' ').title()
             
-            # Get text content
-            text = soup.get_text(separator='\n', strip=True)
+            # Get text content, one stripped text node per line
+            text = '\n'.join(t for t in (node.strip() for node in root.itertext()) if t)
             
             # Clean up text
             text = self._clean_text(text)
             
+            # Tokenize once here; both extraction passes reuse these
+            word_spans = [m.span() for m in _WORD_RE.finditer(text)]
+            
             return {
                 'id': item.get_id(),
                 'name': item.get_name(),
                 'title': title,
                 'content': text,
-                'word_count': len(text.split())
+                'word_count': len(word_spans),
+                'word_spans': word_spans
             }
         except Exception as e:
             print(f"Error parsing chapter {item.get_name()}: {e}")
@@ -91,42 +267,29 @@ class EPUBParser:
     
     def _clean_text(self, text: str) -> str:
         """Clean extracted text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\n+', '\n', text)
-        text = re.sub(r' +', ' ', text)
-        # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s.,;:!?()-]', '', text)
-        return text.strip()
+        # Collapse newline/space runs and drop special characters (keeping
+        # punctuation) in a single pass
+        return _CLEAN_RE.sub(_clean_repl, text).strip()
     
     def extract_seo_knowledge(self, book_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract SEO-specific knowledge chunks from book"""
         knowledge_chunks = []
         
-        seo_keywords = [
-            'meta tag', 'schema.org', 'structured data', 'json-ld', 'rich snippet',
-            'open graph', 'twitter card', 'canonical', 'robots.txt', 'sitemap',
-            'keyword research', 'backlink', 'domain authority', 'page rank',
-            'on-page seo', 'off-page seo', 'technical seo', 'local seo',
-            'content optimization', 'title tag', 'meta description', 'header tag',
-            'alt text', 'internal linking', 'url structure', 'site speed',
-            'mobile optimization', 'core web vitals', 'lighthouse',
-            'google search console', 'google analytics', 'ranking factor',
-            'search intent', 'semantic search', 'voice search', 'featured snippet'
-        ]
-        
         for chapter in book_data['chapters']:
-            content = chapter['content']
-            
             # Split into paragraphs/sections
-            paragraphs = [p.strip() for p in content.split('\n') if len(p.strip()) > 50]
+            paragraphs = _paragraphs(chapter['content'])
+            
+            # Lowercase the chapter's paragraphs in one call; lower() never
+            # produces a newline, so the split stays aligned with paragraphs
+            lowered = '\n'.join(paragraphs).lower().split('\n') if paragraphs else []
             
-            for i, para in enumerate(paragraphs):
-                para_lower = para.lower()
+            for i, (para, para_lower) in enumerate(zip(paragraphs, lowered)):
+                found = self._match_keywords(para_lower)
                 
                 # Check if paragraph contains SEO-relevant content
-                relevance_score = sum(1 for kw in seo_keywords if kw in para_lower)
+                relevance_score = len(found & _SEO_KEYWORD_SET)
                 
-                if relevance_score > 0 or any(kw in para_lower for kw in ['seo', 'search engine', 'google', 'ranking']):
+                if relevance_score > 0 or not _TRIGGER_WORD_SET.isdisjoint(found):
                     chunk = {
                         'book_id': book_data['book_id'],
                         'book_title': book_data['title'],
@@ -134,7 +297,7 @@ class EPUBParser:
                         'content': para,
                         'chunk_id': f"{book_data['book_id']}_{chapter['id']}_{i}",
                         'relevance_score': relevance_score,
-                        'category': self._categorize_content(para_lower)
+                        'category': self._categorize_content(para, found)
                     }
                     knowledge_chunks.append(chunk)
         
@@ -145,81 +308,157 @@ class EPUBParser:
         book_data: Dict[str, Any],
         chunk_size: int = 500,
         overlap: int = 50,
+        chapters: Optional[Iterable[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Extract 500-word chunks for vector DB embedding.
         Full coverage for semantic search (not keyword-filtered).
+        Chunks book_data['chapters'] unless a chapter iterable is passed.
         """
+        if chapters is None:
+            chapters = book_data['chapters']
         chunks = []
-        for chapter in book_data['chapters']:
+        for chapter in chapters:
             text = chapter['content']
-            words = text.split()
-            start = 0
-            idx = 0
-            while start < len(words):
-                end = min(start + chunk_size, len(words))
-                chunk_text = ' '.join(words[start:end])
-                if len(chunk_text.strip()) < 50:
+            # Lowercase the chapter once and slice chunks from it at the same
+            # offsets; only valid when lower() preserves every character's length
+            text_lower = text.lower()
+            if len(text_lower) != len(text):
+                text_lower = None
+            # Word boundaries as character offsets: chunks are sliced straight
+            # out of the chapter text instead of re-joining word lists
+            spans = chapter.get('word_spans')
+            if spans is None:
+                spans = [m.span() for m in _WORD_RE.finditer(text)]
+            # Reserve this chapter's slots up front and fill them by index
+            base = len(chunks)
+            chunks.extend([None] * _window_count(len(spans), chunk_size, overlap))
+            for idx, (first, end) in enumerate(_window_bounds(len(spans), chunk_size, overlap)):
+                lo, hi = spans[first][0], spans[end - 1][1]
+                chunk_text = text[lo:hi]
+                if len(chunk_text) < 50:
+                    del chunks[base + idx:]
                     break
-                chunks.append({
+                chunks[base + idx] = {
                     'chunk_id': f"{book_data['book_id']}_{chapter['id']}_{idx}",
                     'book_id': book_data['book_id'],
                     'book_title': book_data['title'],
                     'chapter_title': chapter['title'],
                     'content': chunk_text,
-                    'category': self._categorize_content(chunk_text.lower()),
+                    'category': self._categorize_content(
+                        text_lower[lo:hi] if text_lower is not None else chunk_text.lower()
+                    ),
                     'relevance_score': 0,
-                })
-                start = end - overlap
-                idx += 1
-                if start >= len(words):
-                    break
+                }
         return chunks
 
-    def _categorize_content(self, text: str) -> str:
-        """Categorize content by SEO topic"""
-        categories = {
-            'meta_tags': ['meta tag', 'meta description', 'title tag', 'viewport'],
-            'structured_data': ['schema.org', 'structured data', 'json-ld', 'microdata', 'rich snippet'],
-            'technical_seo': ['robots.txt', 'sitemap', 'canonical', 'redirect', 'crawl', 'index'],
-            'on_page': ['content optimization', 'keyword density', 'header tag', 'h1', 'h2', 'alt text'],
-            'off_page': ['backlink', 'link building', 'guest post', 'social signal'],
-            'local_seo': ['google business', 'local pack', 'citation', 'nap'],
-            'analytics': ['google analytics', 'search console', 'tracking', 'conversion'],
-            'performance': ['site speed', 'core web vitals', 'lighthouse', 'page speed']
-        }
+    def _categorize_content(self, text: str, found: Optional[Set[str]] = None) -> str:
+        """Categorize content by SEO topic (text must be lowercase unless found is given)"""
+        if found is None:
+            found = self._match_keywords(text)
         
-        scores = {}
-        for cat, keywords in categories.items():
-            scores[cat] = sum(1 for kw in keywords if kw in text)
+        if not found:
+            return 'general'
         
-        if max(scores.values()) > 0:
-            return max(scores, key=scores.get)
-        return 'general'
+        # Ties go to the earlier category, so stop as soon as no later
+        # category could score strictly higher
+        best_cat, best_score = 'general', 0
+        for cat, keywords, remaining_max in _CATEGORY_BOUNDS:
+            score = len(found & keywords)
+            if score > best_score:
+                best_cat, best_score = cat, score
+            if best_score >= min(remaining_max, len(found)):
+                break
+        return best_cat
     
     def parse_all_books(self, directory: str = '.') -> List[Dict[str, Any]]:
-        """Parse all EPUB files in directory"""
+        """Parse all EPUB files in directory.
+        
+        Chapters are chunked as they are parsed and their text is not kept,
+        so the returned book records carry metadata and a chapter_count only.
+        """
         path = Path(directory)
-        epub_files = list(path.glob('*.epub'))
+        epub_files = [str(f) for f in path.glob('*.epub')]
         
         all_books = []
         all_knowledge = []
+        if not epub_files:
+            return all_books, all_knowledge
         
-        for epub_file in epub_files:
-            print(f"Parsing: {epub_file.name}")
-            try:
-                book_data = self.parse_epub(str(epub_file))
-                all_books.append(book_data)
-
-                # Use 500-word chunks for semantic search (full coverage)
-                knowledge = self.extract_chunks_for_embedding(book_data)
-                all_knowledge.extend(knowledge)
-                
-                print(f"  - Extracted {len(knowledge)} knowledge chunks from {len(book_data['chapters'])} chapters")
-            except Exception as e:
-                print(f"  - Error: {e}")
+        # Reuse results for books unchanged since they were last parsed
+        cache_dir = path / CACHE_DIR
+        cache_paths = {filepath: _cache_path(cache_dir, filepath) for filepath in epub_files}
+        results = {}
+        for filepath, cache_path in cache_paths.items():
+            if cache_path.exists():
+                try:
+                    with open(cache_path, 'rb') as f:
+                        results[filepath] = pickle.load(f)
+                except Exception:
+                    pass
+        misses = [filepath for filepath in epub_files if filepath not in results]
+        
+        # Books are independent and parsing is CPU-bound, so use one process per core
+        max_workers = max(1, min(len(misses), os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {filepath: executor.submit(_parse_one, filepath) for filepath in misses}
+            for filepath in epub_files:
+                print(f"Parsing: {Path(filepath).name}")
+                try:
+                    if filepath in results:
+                        book_data, knowledge = results[filepath]
+                    else:
+                        book_data, knowledge = futures[filepath].result()
+                        _write_cache(cache_paths[filepath], (book_data, knowledge))
+                    all_books.append(book_data)
+                    all_knowledge.extend(knowledge)
+                    
+                    print(f"  - Extracted {len(knowledge)} knowledge chunks from {book_data['chapter_count']} chapters")
+                except Exception as e:
+                    print(f"  - Error: {e}")
         
         return all_books, all_knowledge
+    
+    def parse_and_chunk(self, filepath: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Parse one EPUB and chunk it chapter by chapter; returns (book_data, chunks)"""
+        with zipfile.ZipFile(filepath) as zf:
+            book = _EPUBPackage(zf)
+            book_data = self._book_info(book, filepath)
+
+            # Use 500-word chunks for semantic search (full coverage)
+            knowledge = []
+            chapter_count = 0
+            for chapter in self.iter_chapters(filepath, book):
+                knowledge.extend(self.extract_chunks_for_embedding(book_data, chapters=(chapter,)))
+                chapter_count += 1
+        book_data['chapter_count'] = chapter_count
+        return book_data, knowledge
+
+
+def _cache_path(cache_dir: Path, filepath: str) -> Path:
+    """Cache file for an EPUB, keyed by its mtime and size and the path it was
+    reached by (the cached filepath and book_id come from that path)"""
+    st = os.stat(filepath)
+    path_key = _path_id(f"{os.path.realpath(filepath)}\0{filepath}")
+    return cache_dir / f"{_CACHE_VERSION}_{st.st_mtime_ns}_{st.st_size}_{path_key}_{Path(filepath).stem}.pkl"
+
+
+def _write_cache(cache_path: Path, result) -> None:
+    """Store a parse result, replacing older entries for the same book and
+    any written by another cache version"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    book = cache_path.name.split('_', 3)[3]
+    for entry in cache_path.parent.iterdir():
+        parts = entry.name.split('_', 3)
+        if parts[0] != _CACHE_VERSION or (len(parts) == 4 and parts[3] == book):
+            entry.unlink(missing_ok=True)
+    with open(cache_path, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _parse_one(filepath: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Worker entry point for parse_all_books (module-level so it pickles)"""
+    return EPUBParser().parse_and_chunk(filepath)
 
 
 if __name__ == '__main__':
@@ -3,11 +3,50 @@ Headline helper using a tiny local model.
 Generates headline suggestions based on a topic and ranks them.
 """
 
-from sentence_transformers import SentenceTransformer, util
+import os
+from functools import lru_cache
 
 # Small, fast (~90MB) model suitable for CPU
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
-_model = SentenceTransformer(MODEL_NAME)
+# Where downloaded weights live; None uses the library default
+CACHE_FOLDER = os.environ.get("SENTENCE_TRANSFORMERS_HOME")
+# 8-bit dynamically-quantized ONNX export shipped in the model repo. The
+# generic u8/u8 file is accurate on any CPU; the avx512_vnni variant's u8s8
+# kernels can saturate on CPUs without VNNI. Set HEADLINE_ONNX_FILE to ""
+# to always use the full-precision torch model
+ONNX_FILE = os.environ.get("HEADLINE_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+_model = None
+
+
+def _onnx_backend_available() -> bool:
+    """True when optimum[onnxruntime] is installed (sentence-transformers'
+    ONNX backend raises a bare Exception without it)"""
+    try:
+        import onnxruntime  # noqa: F401
+        import optimum.onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_model():
+    """Import and load the model on first use so importing this module is free"""
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+        if ONNX_FILE and _onnx_backend_available():
+            try:
+                _model = SentenceTransformer(
+                    MODEL_NAME, device="cpu", cache_folder=CACHE_FOLDER,
+                    backend="onnx", model_kwargs={"file_name": ONNX_FILE},
+                )
+            except (OSError, ValueError) as e:
+                # Missing or unreadable ONNX file
+                print(f"ONNX headline model unavailable ({e}); using the torch model")
+                _model = None
+        if _model is None:
+            _model = SentenceTransformer(MODEL_NAME, device="cpu", cache_folder=CACHE_FOLDER)
+    return _model
 
 TEMPLATES = [
     "How to {topic} in 5 Minutes",
@@ -21,15 +60,27 @@ TEMPLATES = [
 ]
 
 
-def suggest_headlines(topic: str, n: int = 5):
-    topic_clean = (topic or "").strip() or "your SEO"
+@lru_cache(maxsize=512)
+def _rank_headlines(topic_clean: str) -> tuple:
+    """Rank all templates for a topic; cached so repeat topics skip the model"""
     candidates = [t.format(topic=topic_clean) for t in TEMPLATES]
 
-    topic_emb = _model.encode(topic_clean, convert_to_tensor=True)
-    cand_embs = _model.encode(candidates, convert_to_tensor=True)
-    sims = util.cos_sim(topic_emb, cand_embs).tolist()[0]
+    # Topic and candidates share one batched forward pass; unit-length
+    # embeddings make the dot product the cosine similarity
+    embs = _get_model().encode(
+        [topic_clean] + candidates,
+        batch_size=len(candidates) + 1,
+        convert_to_tensor=True,
+        normalize_embeddings=True,
+    )
+    sims = (embs[1:] @ embs[0]).tolist()
     ranked = sorted(zip(candidates, sims), key=lambda x: x[1], reverse=True)
-    return [h for h, _ in ranked[:n]]
+    return tuple(h for h, _ in ranked)
+
+
+def suggest_headlines(topic: str, n: int = 5):
+    topic_clean = (topic or "").strip() or "your SEO"
+    return list(_rank_headlines(topic_clean)[:n])
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 import os
 import json
 import uuid
+import hashlib
 from pathlib import Path
 import sys
 
@@ -11,7 +12,53 @@ sys.path.append(str(Path(__file__).parent / "advanced_seo_engine"))
 from advanced_seo_engine.knowledge_base import VectorKnowledgeBase
 from advanced_seo_engine.epub_ingestion import EPUBIngestionPipeline
 
-def ingest_txt_files(kb, training_dir):
+# Documents are embedded in batches of this size, regardless of source file
+BATCH_SIZE = 128
+
+def _flush(kb, buf, seen):
+    """Embed and store everything buffered so far ({text hash: doc}); the
+    hashes only count as seen once the KB has accepted the documents"""
+    if buf:
+        kb.add_documents(list(buf.values()), batch_size=BATCH_SIZE)
+        seen.update(buf)
+        buf.clear()
+
+# Hashes of every text already embedded, one file per collection inside the
+# DB directory, so wiping the DB or switching collections also forgets them
+SEEN_FILE = "ingested_hashes_{collection}.txt"
+
+def _text_hash(text):
+    """Hash of whitespace/case-normalized text, as hex. One algorithm
+    everywhere, since the hashes are persisted in SEEN_FILE"""
+    norm = " ".join(text.split()).lower().encode()
+    return hashlib.blake2b(norm, digest_size=8).hexdigest()
+
+def _seen_path(kb):
+    return Path(kb.persist_directory) / SEEN_FILE.format(collection=kb.collection_name)
+
+def _load_seen(kb):
+    path = _seen_path(kb)
+    # An empty collection was reset or recreated; nothing in it is ingested
+    if not path.exists() or kb.collection.count() == 0:
+        return set()
+    return set(path.read_text(encoding="utf-8").split())
+
+def _save_seen(kb, seen):
+    path = _seen_path(kb)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(sorted(seen)), encoding="utf-8")
+
+def _add(kb, buf, doc, seen):
+    """Buffer one document unless identical text was already ingested,
+    flushing once a full batch is ready"""
+    h = _text_hash(doc["text"])
+    if h in seen or h in buf:
+        return
+    buf[h] = doc
+    if len(buf) >= BATCH_SIZE:
+        _flush(kb, buf, seen)
+
+def ingest_txt_files(kb, training_dir, buf, seen):
     print(f"--- Ingesting TXT files from {training_dir} ---")
     for txt_file in training_dir.glob("*.txt"):
         if txt_file.name == "seo_rules_extracted.txt":
@@ -23,9 +70,8 @@ def ingest_txt_files(kb, training_dir):
         # Simple chunking by paragraph/lines for TXT
         paragraphs = [p.strip() for p in text.split("\n\n") if len(p.strip()) > 100]
         
-        docs = []
         for i, p in enumerate(paragraphs):
-            docs.append({
+            _add(kb, buf, {
                 "id": f"txt_{txt_file.stem}_{i}",
                 "text": p,
                 "metadata": {
@@ -33,12 +79,9 @@ def ingest_txt_files(kb, training_dir):
                     "type": "text_extract",
                     "chunk_index": i
                 }
-            })
-        
-        if docs:
-            kb.add_documents(docs)
+            }, seen)
 
-def ingest_json_rules(kb, json_path):
+def ingest_json_rules(kb, json_path, buf, seen):
     print(f"--- Ingesting JSON rules from {json_path} ---")
     if not json_path.exists():
         print("JSON rules file not found.")
@@ -48,7 +91,6 @@ def ingest_json_rules(kb, json_path):
         data = json.load(f)
         
     categories = data.get("categories", {})
-    all_docs = []
     
     for cat, rules in categories.items():
         print(f"Processing category: {cat} ({len(rules)} rules)")
@@ -56,7 +98,7 @@ def ingest_json_rules(kb, json_path):
             if len(rule.strip()) < 20:
                 continue
                 
-            all_docs.append({
+            _add(kb, buf, {
                 "id": f"rule_{cat}_{i}",
                 "text": rule,
                 "metadata": {
@@ -65,17 +107,9 @@ def ingest_json_rules(kb, json_path):
                     "type": "rule",
                     "rule_index": i
                 }
-            })
-            
-            # Add in batches
-            if len(all_docs) >= 100:
-                kb.add_documents(all_docs)
-                all_docs = []
-                
-    if all_docs:
-        kb.add_documents(all_docs)
+            }, seen)
 
-def ingest_epubs(kb, pipeline, root_dir):
+def ingest_epubs(kb, pipeline, root_dir, buf, seen):
     print(f"--- Ingesting EPUBs from {root_dir} ---")
     epub_files = list(root_dir.glob("*.epub"))
     for epub_file in epub_files:
@@ -84,12 +118,8 @@ def ingest_epubs(kb, pipeline, root_dir):
             book_data = pipeline.extract_epub(str(epub_file))
             chunks = pipeline.chunk_content(book_data)
             
-            kb_docs = []
             for chunk in chunks:
-                kb_docs.append(chunk.to_dict())
-            
-            if kb_docs:
-                kb.add_documents(kb_docs)
+                _add(kb, buf, chunk.to_dict(), seen)
         except Exception as e:
             print(f"Error processing {epub_file.name}: {e}")
 
@@ -99,13 +129,19 @@ def main():
     json_path = training_dir / "seo_rules_extracted.json"
     
     # Initialize KB
-    kb = VectorKnowledgeBase(persist_directory="./chroma_db")
+    persist_dir = "./chroma_db"
+    kb = VectorKnowledgeBase(persist_directory=persist_dir)
     pipeline = EPUBIngestionPipeline(chunk_size=400, chunk_overlap=50)
     
-    # Run ingestion
-    ingest_json_rules(kb, json_path)
-    ingest_txt_files(kb, training_dir)
-    ingest_epubs(kb, pipeline, workspace_root)
+    # Run ingestion; all sources share one batch buffer and skip any text
+    # embedded before, in this run or a previous one
+    buf = {}
+    seen = _load_seen(kb)
+    ingest_json_rules(kb, json_path, buf, seen)
+    ingest_txt_files(kb, training_dir, buf, seen)
+    ingest_epubs(kb, pipeline, workspace_root, buf, seen)
+    _flush(kb, buf, seen)
+    _save_seen(kb, seen)
     
     print("\n✅ Ingestion complete.")
     print(f"Total documents in KB: {kb.collection.count()}")
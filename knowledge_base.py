@@ -5,22 +5,63 @@ Uses ChromaDB + BGE embeddings for semantic search, SQLite for templates
 
 import sqlite3
 import json
+import queue
+import threading
+import time
 import warnings
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 # Suppress HuggingFace/tokenizer warnings during load
 warnings.filterwarnings("ignore")
 
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 
+from bge_onnx import BGEOnnxEncoder, onnx_model_available
+from embed_server import connect_embedder
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
 # BGE models use prefixes for best performance
 BGE_QUERY_PREFIX = "query: "
 BGE_PASSAGE_PREFIX = "passage: "
 EMBEDDING_MODEL = "BAAI/bge-large-en-v1.5"
 CHROMA_COLLECTION = "seobot_knowledge"
+# Unit-length embeddings + cosine space: distance is 1 - cosine similarity
+COLLECTION_METADATA = {"hnsw:space": "cosine", "description": "SEOBOT knowledge chunks"}
+# Texts per encoder forward pass during bulk embedding
+EMBED_BATCH_SIZE = 64
+# Query embeddings kept in memory so repeated searches skip the model
+QUERY_CACHE_SIZE = 4096
+# Optional FAISS HNSW index answering unfiltered searches in front of Chroma
+FAISS_INDEX_FILE = "faiss_hnsw.index"
+FAISS_IDS_FILE = "faiss_ids.json"
+FAISS_HNSW_M = 32
+FAISS_EF_SEARCH = 128
+
+
+def _chroma_similarity(collection):
+    """Distance -> cosine similarity for the collection's metric. Stores
+    created before the cosine space keep squared L2, which on unit vectors
+    is 2 - 2*cos"""
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+    if space == "l2":
+        return lambda d: 1.0 - d / 2.0
+    return lambda d: 1.0 - d
+
+
+def _faiss_similarity(index):
+    """Score -> cosine similarity for a FAISS index (inner product or squared L2)"""
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        return lambda d: d
+    return lambda d: 1.0 - d / 2.0
 
 
 class SEOKnowledgeBase:
@@ -33,47 +74,238 @@ class SEOKnowledgeBase:
         self.chroma_path = Path(db_path).parent / "chroma_db"
         self.chroma_client = None
         self.collection = None
+        # Live collection; a rebuild switches to a fresh versioned name
+        self._collection_name = CHROMA_COLLECTION
+        # Collection size, kept here so queries don't re-count the store
+        self._cached_count = 0
         self.embedder = None
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._history_q = queue.Queue()
+        self._history_thread = None
+        # Background deletions of retired collections, joined on close()
+        self._drop_threads = []
+        # FAISS row i holds the embedding of chunk _faiss_ids[i]
+        self._faiss_index = None
+        self._faiss_ids = []
 
     def connect(self):
         """Connect to SQLite and ChromaDB"""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
+        # WAL + NORMAL sync: commits append to the log without an fsync each
+        self.cursor.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+        """)
 
         self.chroma_path.mkdir(parents=True, exist_ok=True)
         self.chroma_client = chromadb.PersistentClient(
             path=str(self.chroma_path),
             settings=Settings(anonymized_telemetry=False),
         )
+        row = None
+        try:
+            self.cursor.execute("SELECT value FROM kb_settings WHERE key = 'collection'")
+            row = self.cursor.fetchone()
+            if row:
+                self._collection_name = row[0]
+        except sqlite3.OperationalError:
+            pass  # database not initialized yet; use the default name
         self.collection = self.chroma_client.get_or_create_collection(
-            name=CHROMA_COLLECTION,
-            metadata={"description": "SEOBOT knowledge chunks"},
+            name=self._collection_name,
+            metadata=COLLECTION_METADATA,
         )
+        if row:
+            # Collections retired by a reset whose drop never finished
+            for name in self._stale_collections():
+                self._drop_in_background(name)
+        self._cached_count = self.collection.count()
+        self._load_faiss()
+
+        # Search history is written off the query path by one writer thread
+        self._history_thread = threading.Thread(target=self._history_writer, daemon=True)
+        self._history_thread.start()
 
         return self
 
     def close(self):
         """Close database connections"""
+        for thread in self._drop_threads:
+            thread.join()
+        self._drop_threads = []
+        if self._history_thread is not None:
+            self._history_q.put(None)
+            self._history_thread.join()
+            self._history_thread = None
         if self.conn:
             self.conn.close()
 
-    def _get_embedder(self) -> SentenceTransformer:
-        """Lazy load embedding model"""
+    def _history_writer(self):
+        """Insert queued (query, results_count) rows in batches on a private
+        connection, until a None sentinel arrives"""
+        conn = sqlite3.connect(self.db_path)
+        running = True
+        while running:
+            # Collect whatever arrives within 100ms of the first row
+            items = [self._history_q.get()]
+            deadline = time.monotonic() + 0.1
+            while len(items) < 100:
+                try:
+                    items.append(self._history_q.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            rows = [item for item in items if item is not None]
+            running = len(rows) == len(items)
+            if rows:
+                try:
+                    conn.executemany(
+                        "INSERT INTO search_history (query, results_count) VALUES (?, ?)",
+                        rows,
+                    )
+                    conn.commit()
+                except sqlite3.Error:
+                    pass
+            for _ in items:
+                self._history_q.task_done()
+        conn.close()
+
+    def _get_embedder(self):
+        """Lazy load embedding model: the warm embedding server if one is
+        reachable, else an ONNX Runtime export if present, else PyTorch"""
         if self.embedder is None:
-            print("Loading embedding model (BGE-large)...")
-            self.embedder = SentenceTransformer(EMBEDDING_MODEL)
+            client = connect_embedder()
+            if client is not None:
+                print("Using embedding server at", client.url)
+                self.embedder = client
+            elif onnx_model_available():
+                print("Loading embedding model (BGE-large, ONNX)...")
+                self.embedder = BGEOnnxEncoder()
+            else:
+                print("Loading embedding model (BGE-large)...")
+                self.embedder = SentenceTransformer(EMBEDDING_MODEL)
+                import torch
+                if torch.cuda.is_available():
+                    # FP16 halves memory traffic; fine for normalized embeddings
+                    self.embedder.half()
         return self.embedder
 
+    def _embed_query(self, query: str):
+        """Embedding for a search query, served from an LRU cache when seen before"""
+        # BGE's tokenizer is uncased, so case and outer whitespace don't
+        # change the embedding
+        key = query.strip().lower()
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(key)
+            if embedding is not None:
+                self._query_cache.move_to_end(key)
+                return embedding
+
+        embedding = self._get_embedder().encode(
+            [BGE_QUERY_PREFIX + key],
+            show_progress_bar=False,
+            normalize_embeddings=True,
+        )[0]
+
+        with self._query_cache_lock:
+            self._query_cache[key] = embedding
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return embedding
+
+    def _load_faiss(self):
+        """Load the persisted FAISS index if faiss is installed and it exists"""
+        if faiss is None:
+            return
+        index_path = self.chroma_path / FAISS_INDEX_FILE
+        ids_path = self.chroma_path / FAISS_IDS_FILE
+        if index_path.exists() and ids_path.exists():
+            self._faiss_index = faiss.read_index(str(index_path))
+            self._faiss_index.hnsw.efSearch = FAISS_EF_SEARCH
+            self._faiss_ids = json.loads(ids_path.read_text(encoding="utf-8"))
+
+    def _faiss_add(self, ids: List[str], embeddings: np.ndarray):
+        """Append new chunks to the FAISS index and persist it"""
+        if faiss is None:
+            return
+        if self._faiss_index is None:
+            if self._cached_count > len(ids):
+                # Store predates the index; it is built on the next full rebuild
+                return
+            self._faiss_index = faiss.IndexHNSWFlat(
+                embeddings.shape[1], FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            self._faiss_index.hnsw.efSearch = FAISS_EF_SEARCH
+            self._faiss_ids = []
+        # Chroma skips ids it already holds; keep the index in step with it
+        known = set(self._faiss_ids)
+        new_rows = [i for i, cid in enumerate(ids) if cid not in known]
+        if not new_rows:
+            return
+        self._faiss_index.add(embeddings[new_rows])
+        self._faiss_ids.extend(ids[i] for i in new_rows)
+        faiss.write_index(self._faiss_index, str(self.chroma_path / FAISS_INDEX_FILE))
+        (self.chroma_path / FAISS_IDS_FILE).write_text(json.dumps(self._faiss_ids), encoding="utf-8")
+
+    def _faiss_usable(self) -> bool:
+        """True when the FAISS index covers exactly the chunks in Chroma"""
+        return self._faiss_index is not None and self._faiss_index.ntotal == self._cached_count
+
     def reset_vector_store(self):
-        """Clear all chunks (for full rebuild)"""
-        self.chroma_client.delete_collection(CHROMA_COLLECTION)
+        """Clear all chunks (for full rebuild).
+
+        Switches to a new, empty collection and drops the old one in the
+        background, so a large store doesn't block the rebuild while it is
+        deleted.
+        """
+        old_name = self._collection_name
+        new_name = f"{CHROMA_COLLECTION}_{time.time_ns() // 1_000_000}"
         self.collection = self.chroma_client.create_collection(
-            name=CHROMA_COLLECTION,
-            metadata={"description": "SEOBOT knowledge chunks"},
+            name=new_name,
+            metadata=COLLECTION_METADATA,
         )
+        self._collection_name = new_name
+        self.cursor.execute(
+            "INSERT OR REPLACE INTO kb_settings (key, value) VALUES ('collection', ?)",
+            (new_name,),
+        )
+        self._drop_in_background(old_name)
+        self._cached_count = 0
+        self._faiss_index = None
+        self._faiss_ids = []
+        for name in (FAISS_INDEX_FILE, FAISS_IDS_FILE):
+            (self.chroma_path / name).unlink(missing_ok=True)
+        self.cursor.execute("DELETE FROM chunk_index")
+        self.conn.commit()
         print("Vector store reset.")
 
+    def _stale_collections(self) -> List[str]:
+        """Names of this KB's collections other than the live one"""
+        names = []
+        for collection in self.chroma_client.list_collections():
+            # Older chromadb returns Collection objects, newer returns names
+            name = getattr(collection, "name", collection)
+            versioned = name.startswith(CHROMA_COLLECTION + "_") and name[len(CHROMA_COLLECTION) + 1:].isdigit()
+            if name != self._collection_name and (name == CHROMA_COLLECTION or versioned):
+                names.append(name)
+        return names
+
+    def _drop_in_background(self, name: str):
+        """Delete a retired collection without blocking; close() waits for it"""
+        thread = threading.Thread(target=self._drop_collection, args=(name,), daemon=True)
+        thread.start()
+        self._drop_threads.append(thread)
+
+    def _drop_collection(self, name: str):
+        """Delete a retired collection (runs on a background thread)"""
+        try:
+            self.chroma_client.delete_collection(name)
+        except Exception:
+            pass  # already gone
+
     def init_database(self):
         """Initialize SQLite schema (templates only; chunks live in ChromaDB)"""
         self.cursor.executescript("""
@@ -104,6 +336,22 @@ class SEOKnowledgeBase:
                 results_count INTEGER,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
+            CREATE INDEX IF NOT EXISTS idx_history_ts ON search_history(timestamp);
+            CREATE INDEX IF NOT EXISTS idx_history_query ON search_history(query, results_count);
+
+            -- Small key/value settings (e.g. the live Chroma collection)
+            CREATE TABLE IF NOT EXISTS kb_settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+
+            -- Per-chunk book/category, mirrored from ChromaDB for stats
+            CREATE TABLE IF NOT EXISTS chunk_index (
+                chunk_id TEXT PRIMARY KEY,
+                book_id TEXT,
+                category TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_chunk_index_category ON chunk_index(category);
         """)
         self.conn.commit()
         return self
@@ -115,7 +363,7 @@ class SEOKnowledgeBase:
     def add_knowledge_chunks(
         self,
         chunks: List[Dict[str, Any]],
-        batch_size: int = 100,
+        batch_size: int = 1000,
     ):
         """Add chunks to ChromaDB with BGE embeddings"""
         if not chunks:
@@ -124,32 +372,73 @@ class SEOKnowledgeBase:
         print(f"Embedding {len(chunks)} chunks...")
         model = self._get_embedder()
 
-        ids = []
-        documents = []
-        metadatas = []
-
-        for c in chunks:
-            ids.append(c["chunk_id"])
-            documents.append(c["content"])
-            metadatas.append({
-                "book_id": c.get("book_id", ""),
+        # Build each column in its own comprehension, then zip the metadata rows
+        ids = [c["chunk_id"] for c in chunks]
+        documents = [c["content"] for c in chunks]
+        book_ids = [c.get("book_id", "") for c in chunks]
+        categories = [c.get("category", "general") for c in chunks]
+        metadatas = [
+            {
+                "book_id": book_id,
                 "book_title": c.get("book_title", ""),
                 "chapter_title": c.get("chapter_title", ""),
-                "category": c.get("category", "general"),
+                "category": category,
                 "relevance_score": str(c.get("relevance_score", 0)),
-            })
+            }
+            for c, book_id, category in zip(chunks, book_ids, categories)
+        ]
 
-        # BGE passage prefix for documents
-        docs_for_embed = [BGE_PASSAGE_PREFIX + d for d in documents]
-        embeddings = model.encode(docs_for_embed, show_progress_bar=True)
+        # Encode in length order so each batch pads to similar-length texts,
+        # then scatter the rows back to chunk order
+        order = np.argsort([len(d) for d in documents], kind="stable")
+        sorted_docs = [documents[i] for i in order]
+        if isinstance(model, BGEOnnxEncoder):
+            # BGE passage prefix spliced in as pre-tokenized ids
+            sorted_embeddings = model.encode(
+                sorted_docs,
+                batch_size=EMBED_BATCH_SIZE,
+                normalize_embeddings=True,
+                prefix=BGE_PASSAGE_PREFIX,
+            )
+        else:
+            # BGE passage prefix for documents
+            sorted_embeddings = model.encode(
+                [BGE_PASSAGE_PREFIX + d for d in sorted_docs],
+                batch_size=EMBED_BATCH_SIZE,
+                show_progress_bar=True,
+                normalize_embeddings=True,
+            )
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
 
+        # Hand Chroma the float32 array slices directly; chromadb versions
+        # that only validate nested lists get .tolist() instead
+        as_array = True
         for i in range(0, len(ids), batch_size):
-            self.collection.add(
+            batch = embeddings[i : i + batch_size]
+            kwargs = dict(
                 ids=ids[i : i + batch_size],
-                embeddings=embeddings[i : i + batch_size].tolist(),
                 documents=documents[i : i + batch_size],
                 metadatas=metadatas[i : i + batch_size],
             )
+            if as_array:
+                try:
+                    self.collection.add(embeddings=batch, **kwargs)
+                    continue
+                except ValueError:
+                    as_array = False
+            self.collection.add(embeddings=batch.tolist(), **kwargs)
+        # Recount once rather than adding len(chunks): Chroma skips ids it
+        # already holds
+        self._cached_count = self.collection.count()
+        self._faiss_add(ids, embeddings)
+
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO chunk_index (chunk_id, book_id, category) VALUES (?, ?, ?)",
+            list(zip(ids, book_ids, categories)),
+        )
+        self.conn.commit()
 
         print("Chunks added to vector store.")
 
@@ -160,96 +449,116 @@ class SEOKnowledgeBase:
         category: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """Semantic search using BGE embeddings"""
-        self.cursor.execute(
-            "INSERT INTO search_history (query) VALUES (?)",
-            (query,),
-        )
-        self.conn.commit()
-
-        if self.collection.count() == 0:
+        if self._cached_count == 0:
+            self._log_search(query, 0)
             return []
 
-        model = self._get_embedder()
-        query_embedding = model.encode(
-            [BGE_QUERY_PREFIX + query],
-            show_progress_bar=False,
-        )[0].tolist()
+        query_embedding = self._embed_query(query)
+        n_results = min(limit, self._cached_count)
 
-        where = {"category": category} if category else None
-
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=min(limit * 2, self.collection.count()) or limit,
-            where=where,
-            include=["documents", "metadatas", "distances"],
-        )
+        if category is None and self._faiss_usable():
+            # Rank with FAISS, then fetch the winners' text and metadata by id
+            dists, rows = self._faiss_index.search(
+                np.asarray(query_embedding, dtype=np.float32)[None, :], n_results
+            )
+            hits = [(self._faiss_ids[r], d) for r, d in zip(rows[0], dists[0]) if r >= 0]
+            data = self.collection.get(
+                ids=[cid for cid, _ in hits],
+                include=["documents", "metadatas"],
+            )
+            by_id = {
+                cid: (doc, meta)
+                for cid, doc, meta in zip(data["ids"], data["documents"], data["metadatas"])
+            }
+            found = [(by_id[cid], float(d)) for cid, d in hits if cid in by_id]
+            to_similarity = _faiss_similarity(self._faiss_index)
+        else:
+            where = {"category": category} if category else None
+            results = self.collection.query(
+                query_embeddings=[query_embedding.tolist()],
+                n_results=n_results,
+                where=where,
+                include=["documents", "metadatas", "distances"],
+            )
+            found = []
+            if results["documents"] and results["documents"][0]:
+                for i, doc in enumerate(results["documents"][0]):
+                    meta = results["metadatas"][0][i] if results["metadatas"] else {}
+                    dist = results["distances"][0][i] if results["distances"] else 0
+                    found.append(((doc, meta), dist))
+            to_similarity = _chroma_similarity(self.collection)
 
         out = []
-        if results["documents"] and results["documents"][0]:
-            for i, doc in enumerate(results["documents"][0]):
-                meta = results["metadatas"][0][i] if results["metadatas"] else {}
-                dist = results["distances"][0][i] if results["distances"] else 0
-                # ChromaDB uses L2 distance; lower = more similar. Convert to similarity-like score
-                similarity = 1.0 / (1.0 + dist) if dist is not None else 1.0
-                out.append({
-                    "id": meta.get("book_id", "") + "_" + str(i),
-                    "book_title": meta.get("book_title", ""),
-                    "chapter_title": meta.get("chapter_title", ""),
-                    "content": doc,
-                    "category": meta.get("category", "general"),
-                    "relevance_score": int(meta.get("relevance_score", 0)),
-                    "similarity": similarity,
-                    "combined_score": similarity,
-                })
-
-        out.sort(key=lambda x: x["combined_score"], reverse=True)
-        out = out[:limit]
-
-        self.cursor.execute(
-            "UPDATE search_history SET results_count = ? WHERE id = last_insert_rowid()",
-            (len(out),),
-        )
-        self.conn.commit()
+        for i, ((doc, meta), dist) in enumerate(found):
+            similarity = to_similarity(dist) if dist is not None else 1.0
+            out.append({
+                "id": meta.get("book_id", "") + "_" + str(i),
+                "book_title": meta.get("book_title", ""),
+                "chapter_title": meta.get("chapter_title", ""),
+                "content": doc,
+                "category": meta.get("category", "general"),
+                "relevance_score": int(meta.get("relevance_score", 0)),
+                "similarity": similarity,
+                "combined_score": similarity,
+            })
 
+        # Hits come back nearest-first and similarity is monotone in
+        # distance, so the results are already in ranked order
+        self._log_search(query, len(out))
         return out
 
+    def _log_search(self, query: str, results_count: int):
+        """Queue a search for the history writer thread"""
+        self._history_q.put((query, results_count))
+
     def semantic_search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Alias for search (both use semantic retrieval now)"""
         return self.search(query, limit=limit)
 
+    def _sync_chunk_index(self) -> int:
+        """Backfill chunk_index from ChromaDB when the two disagree (e.g. a
+        vector store built before the table existed); returns the chunk count"""
+        total = self._cached_count
+        self.cursor.execute("SELECT COUNT(*) FROM chunk_index")
+        if self.cursor.fetchone()[0] == total:
+            return total
+
+        self.cursor.execute("DELETE FROM chunk_index")
+        page = 1000
+        for offset in range(0, total, page):
+            data = self.collection.get(include=["metadatas"], limit=page, offset=offset)
+            self.cursor.executemany(
+                "INSERT OR REPLACE INTO chunk_index (chunk_id, book_id, category) VALUES (?, ?, ?)",
+                [
+                    (cid, m.get("book_id", ""), m.get("category", "general"))
+                    for cid, m in zip(data["ids"], data["metadatas"])
+                ],
+            )
+        self.conn.commit()
+        return total
+
     def get_categories(self) -> List[str]:
-        """Get distinct categories from ChromaDB metadata"""
-        if self.collection.count() == 0:
+        """Get distinct chunk categories"""
+        if self._sync_chunk_index() == 0:
             return []
-        # ChromaDB doesn't have GROUP BY; get all and dedupe
-        data = self.collection.get(include=["metadatas"])
-        cats = set()
-        if data and data.get("metadatas"):
-            for m in data["metadatas"]:
-                c = m.get("category", "general")
-                if c:
-                    cats.add(c)
-        return sorted(cats)
+        self.cursor.execute(
+            "SELECT DISTINCT category FROM chunk_index WHERE category != '' ORDER BY category"
+        )
+        return [row[0] for row in self.cursor.fetchall()]
 
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
         stats = {}
-        stats["total_chunks"] = self.collection.count()
-        data = self.collection.get(include=["metadatas"])
-        book_ids = set()
-        if data and data.get("metadatas"):
-            for m in data["metadatas"]:
-                bid = m.get("book_id", "")
-                if bid:
-                    book_ids.add(bid)
-        stats["total_books"] = len(book_ids)
+        stats["total_chunks"] = self._sync_chunk_index()
+        self.cursor.execute("SELECT COUNT(DISTINCT book_id) FROM chunk_index WHERE book_id != ''")
+        stats["total_books"] = self.cursor.fetchone()[0]
+        self._history_q.join()  # count searches still queued for the writer
         self.cursor.execute("SELECT COUNT(*) FROM search_history")
         stats["total_searches"] = self.cursor.fetchone()[0]
-        stats["categories"] = {c: 0 for c in self.get_categories()}
-        if data and data.get("metadatas"):
-            for m in data["metadatas"]:
-                c = m.get("category", "general")
-                stats["categories"][c] = stats["categories"].get(c, 0) + 1
+        self.cursor.execute(
+            "SELECT category, COUNT(*) FROM chunk_index GROUP BY category ORDER BY category"
+        )
+        stats["categories"] = {row[0]: row[1] for row in self.cursor.fetchall()}
         return stats
 
     def init_schema_templates(self):
@@ -304,11 +613,10 @@ class SEOKnowledgeBase:
                 "example": "Site navigation breadcrumbs",
             },
         ]
-        for t in templates:
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO schema_templates (id, schema_type, name, template, description, example) VALUES (?, ?, ?, ?, ?, ?)",
-                (t["id"], t["schema_type"], t["name"], t["template"], t["description"], t["example"]),
-            )
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO schema_templates (id, schema_type, name, template, description, example) VALUES (?, ?, ?, ?, ?, ?)",
+            [(t["id"], t["schema_type"], t["name"], t["template"], t["description"], t["example"]) for t in templates],
+        )
         self.conn.commit()
 
     def init_meta_templates(self):
@@ -331,11 +639,10 @@ class SEOKnowledgeBase:
             {"id": "twitter_description", "tag_type": "twitter", "name": "Twitter Description", "template": '<meta name="twitter:description" content="{{description}}">', "description": "Twitter card description", "priority": 2},
             {"id": "twitter_image", "tag_type": "twitter", "name": "Twitter Image", "template": '<meta name="twitter:image" content="{{image_url}}">', "description": "Twitter card image", "priority": 2},
         ]
-        for t in templates:
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO meta_templates (id, tag_type, name, template, description, priority) VALUES (?, ?, ?, ?, ?, ?)",
-                (t["id"], t["tag_type"], t["name"], t["template"], t["description"], t["priority"]),
-            )
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO meta_templates (id, tag_type, name, template, description, priority) VALUES (?, ?, ?, ?, ?, ?)",
+            [(t["id"], t["tag_type"], t["name"], t["template"], t["description"], t["priority"]) for t in templates],
+        )
         self.conn.commit()
 
     def get_schema_templates(self, schema_type: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -11,12 +11,19 @@ warnings.filterwarnings('ignore')
 import os
 sys.stderr = open(os.devnull, 'w')
 
+from advanced_seo_engine import VectorKnowledgeBase, ConceptGraph, SEOOrchestrator
 from advanced_seo_engine.epub_ingestion import EPUBIngestionPipeline
-from advanced_seo_engine.knowledge_base import VectorKnowledgeBase
-from advanced_seo_engine.concept_graph import ConceptGraph
-from advanced_seo_engine.orchestrator import SEOOrchestrator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+def _process_book_worker(filepath):
+    """Chunk one EPUB in a worker process (module-level so it pickles)"""
+    pipeline = EPUBIngestionPipeline(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    return pipeline.process_book(filepath)
+
 def main():
     print("="*60)
     print("🤖 SEOBOT Advanced Launcher")
@@ -43,19 +50,21 @@ def main():
     graph_path = data_dir / "concept_graph.json"
     cg = ConceptGraph(str(graph_path))
     
-    # Check if we need to ingest
-    stats = kb.get_stats()
-    if stats['total_documents'] == 0 and epub_files:
+    # Check if we need to ingest (a count is enough; full stats come later)
+    if kb.collection.count() == 0 and epub_files:
         print("\n📥 Ingesting EPUB files...")
-        pipeline = EPUBIngestionPipeline(chunk_size=500, chunk_overlap=50)
+        pipeline = EPUBIngestionPipeline(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
         
+        # Parsing/chunking is CPU-bound, so spread the books over processes;
+        # embedding below stays in this process
         all_chunks = []
-        for epub_file in epub_files:
-            try:
-                chunks = pipeline.process_book(str(epub_file))
-                all_chunks.extend(chunks)
-            except Exception as e:
-                print(f"   ⚠ Error: {e}")
+        with ProcessPoolExecutor(max_workers=min(len(epub_files), os.cpu_count() or 1)) as ex:
+            futures = [ex.submit(_process_book_worker, str(f)) for f in epub_files]
+            for future in futures:
+                try:
+                    all_chunks.extend(future.result())
+                except Exception as e:
+                    print(f"   ⚠ Error: {e}")
         
         if all_chunks:
             print(f"\n📤 Adding {len(all_chunks)} chunks to knowledge base...")
@@ -65,8 +74,7 @@ def main():
             # Build concept graph
             print("🕸️  Building concept graph...")
             concepts = pipeline.extract_concepts(all_chunks)
-            for concept, chunk_ids in list(concepts.items())[:100]:
-                cg.add_concept(concept, 'extracted', 'epub')
+            cg.add_concepts((concept, 'extracted', 'epub') for concept in list(concepts)[:100])
             cg.save()
     
     # Initialize orchestrator
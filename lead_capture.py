@@ -4,15 +4,20 @@ Handles smart fill extraction, lead database, and RAG-powered recommendations
 """
 
 import sqlite3
+import asyncio
 import json
 import re
-import uuid
+import secrets
 import csv
 import time
+import atexit
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+from functools import lru_cache
 from urllib.parse import urlparse
 
 # Selenium imports (optional - falls back to requests if not available)
@@ -23,6 +28,7 @@ try:
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import WebDriverException
     from webdriver_manager.chrome import ChromeDriverManager
     SELENIUM_AVAILABLE = True
 except ImportError:
@@ -30,6 +36,174 @@ except ImportError:
 
 # Fallback to requests
 import requests
+from lxml import etree, html as lxml_html
+
+# Faster JSON-LD parsing (optional)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Async bulk scanning (optional)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Pooled keep-alive connections for the requests fallback
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': USER_AGENT})
+_adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=2)
+_SESSION.mount('http://', _adapter)
+_SESSION.mount('https://', _adapter)
+
+# Text-mining patterns, compiled once and shared by every scan
+# (the <address> patterns are only a fallback for pages lxml can't parse)
+_ADDRESS_TAG_RE = re.compile(r'<address[^>]*>(.*?)</address>', re.I | re.DOTALL)
+# The number itself may not cross a newline: page text puts each text node on
+# its own line, so a capture can't run on into the next element
+_PHONE_LABELED_RE = re.compile(r'(?:phone|tel|call|contact)[:\s]*([+\d \t\(\)-]{10,})', re.I)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', re.I)
+# Placeholder/system addresses to skip (the page-wide scan is stricter)
+_FOOTER_BAD_EMAIL_RE = re.compile(r'example|test|noreply|no-reply', re.I)
+_BAD_EMAIL_RE = re.compile(r'example|test|noreply|no-reply|@sentry|@seo', re.I)
+# US format
+_PHONE_RE = re.compile(r'(?:\+1[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}')
+
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+
+def _parse_html(html: str):
+    """Parse a page once into an lxml tree (None if empty or unparseable)"""
+    if not html:
+        return None
+    try:
+        return lxml_html.document_fromstring(html.encode('utf-8', 'replace'), parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def _first_attr(tree, xpath: str) -> str:
+    """First attribute value matched by xpath, stripped"""
+    values = tree.xpath(xpath)
+    return values[0].strip() if values else ""
+
+
+def _schema_address(address) -> str:
+    """Flatten a schema.org address (PostalAddress dict or plain string)"""
+    if isinstance(address, dict):
+        parts = [
+            address[key]
+            for key in ("streetAddress", "addressLocality", "addressRegion", "postalCode")
+            if address.get(key)
+        ]
+        return ", ".join(parts)
+    if isinstance(address, str):
+        return address
+    return ""
+
+
+def _schema_nodes(schema_data: List):
+    """Every JSON-LD object, descending into top-level arrays and @graph"""
+    for item in schema_data:
+        if isinstance(item, list):
+            yield from _schema_nodes(item)
+        elif isinstance(item, dict):
+            yield item
+            graph = item.get("@graph")
+            if isinstance(graph, list):
+                yield from _schema_nodes(graph)
+
+
+def _flatten_schema(schema_data: List) -> Dict[str, str]:
+    """First non-empty name, email, telephone and address across all schema.org data"""
+    flat = {}
+    for node in _schema_nodes(schema_data):
+        for key in ("name", "email", "telephone"):
+            if key not in flat and node.get(key):
+                flat[key] = node[key]
+        if "address" not in flat:
+            address = _schema_address(node.get("address", {}))
+            if address:
+                flat["address"] = address
+        if len(flat) == 4:
+            break
+    return flat
+
+
+# Contact details usually sit in the last part of a page, so page-wide
+# email/phone scans try this many trailing characters before the whole text
+TAIL_SCAN_CHARS = 20_000
+
+
+def _tail_first(text: str):
+    """The tail of text, then (only if longer) the full text"""
+    if len(text) <= TAIL_SCAN_CHARS:
+        yield text
+        return
+    # Start the tail after a whitespace break so no match is cut in half
+    yield text[-TAIL_SCAN_CHARS:].split(None, 1)[-1]
+    yield text
+
+
+def _element_text(el) -> str:
+    """Text of el, one text node per line, so adjacent tags don't run together"""
+    return '\n'.join(el.itertext())
+
+
+def _page_text(tree) -> str:
+    """Visible text of the page body"""
+    body = tree.find('body')
+    return _element_text(body if body is not None else tree)
+
+
+_OG_TAGS = ["og:title", "og:description", "og:image", "og:url", "og:site_name"]
+# Images (for alt text analysis) and links kept per page
+_MAX_IMAGES = 50
+_MAX_LINKS = 100
+
+# Everything scan_url needs from the rendered DOM, gathered in one
+# chromedriver round trip instead of one per element/attribute
+_EXTRACT_PAGE_JS = """
+const meta = sel => {
+    const el = document.querySelector(sel);
+    return el ? (el.getAttribute('content') || '') : null;
+};
+const og = {};
+for (const tag of arguments[0]) {
+    const value = meta(`meta[property="${tag}"]`);
+    if (value !== null) og[tag] = value;
+}
+const first = (nodes, n) => Array.prototype.slice.call(nodes, 0, n);
+// h1-h3 in one document-order walk, bucketed by level
+const headings = {h1: [], h2: [], h3: []};
+for (const el of document.querySelectorAll('h1, h2, h3')) {
+    const text = el.innerText.trim();
+    if (text) headings[el.tagName.toLowerCase()].push(text);
+}
+return {
+    title: document.title || '',
+    description: meta('meta[name="description"]') || '',
+    og_data: og,
+    schema: Array.from(document.querySelectorAll('script[type="application/ld+json"]'))
+        .map(el => el.textContent),
+    headings: headings,
+    images: first(document.images, arguments[1])
+        .map(img => ({src: img.getAttribute('src') === null ? null : img.src, alt: img.getAttribute('alt') || ''})),
+    links: first(document.getElementsByTagName('a'), arguments[2])
+        .map(a => ({href: a.getAttribute('href') === null ? null : a.href, text: a.innerText.trim()}))
+};
+"""
+
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Resolve (and download if needed) chromedriver once per process"""
+    return ChromeDriverManager().install()
 
 
 class SeleniumScanner:
@@ -53,13 +227,13 @@ class SeleniumScanner:
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
         options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        options.add_argument(f"user-agent={USER_AGENT}")
 
         # Suppress logging
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
 
         try:
-            service = Service(ChromeDriverManager().install())
+            service = Service(_chromedriver_path())
             self.driver = webdriver.Chrome(service=service, options=options)
             self.driver.set_page_load_timeout(self.timeout)
         except Exception as e:
@@ -72,6 +246,14 @@ class SeleniumScanner:
         """
         if not self.driver:
             self._init_driver()
+        else:
+            # Reused driver: start each URL with clean cookies, and restart
+            # Chrome if the session died (InvalidSessionIdException etc.)
+            try:
+                self.driver.delete_all_cookies()
+            except WebDriverException:
+                self.close()
+                self._init_driver()
 
         page_data = {
             "url": url,
@@ -103,64 +285,27 @@ class SeleniumScanner:
             # Get rendered HTML
             html = self.driver.page_source
 
-            # Extract page data
-            page_data["title"] = self.driver.title or ""
-
-            # Get meta description
-            try:
-                desc_el = self.driver.find_element(By.CSS_SELECTOR, 'meta[name="description"]')
-                page_data["description"] = desc_el.get_attribute("content") or ""
-            except:
-                pass
-
-            # Get OG data
-            og_tags = ["og:title", "og:description", "og:image", "og:url", "og:site_name"]
-            for tag in og_tags:
-                try:
-                    el = self.driver.find_element(By.CSS_SELECTOR, f'meta[property="{tag}"]')
-                    page_data["og_data"][tag] = el.get_attribute("content") or ""
-                except:
-                    pass
-
-            # Get schema.org JSON-LD
+            # Extract page data in a single script call
             try:
-                schema_scripts = self.driver.find_elements(By.CSS_SELECTOR, 'script[type="application/ld+json"]')
-                for script in schema_scripts:
+                data = self.driver.execute_script(_EXTRACT_PAGE_JS, _OG_TAGS, _MAX_IMAGES, _MAX_LINKS)
+            except WebDriverException:
+                data = None
+            if data:
+                page_data["title"] = data.get("title", "")
+                page_data["description"] = data.get("description", "")
+                page_data["og_data"] = data.get("og_data") or {}
+                page_data["headings"] = data.get("headings") or page_data["headings"]
+                page_data["images"] = data.get("images") or []
+                page_data["links"] = data.get("links") or []
+
+                # Get schema.org JSON-LD
+                for schema_str in data.get("schema") or []:
                     try:
-                        schema_json = json.loads(script.get_attribute("innerHTML"))
-                        page_data["schema_data"].append(schema_json)
+                        page_data["schema_data"].append(_json_loads(schema_str))
                     except:
                         pass
-            except:
-                pass
-
-            # Get headings
-            for h_level in ["h1", "h2", "h3"]:
-                try:
-                    headings = self.driver.find_elements(By.TAG_NAME, h_level)
-                    page_data["headings"][h_level] = [h.text.strip() for h in headings if h.text.strip()]
-                except:
-                    pass
-
-            # Get images (for alt text analysis)
-            try:
-                images = self.driver.find_elements(By.TAG_NAME, "img")
-                page_data["images"] = [
-                    {"src": img.get_attribute("src"), "alt": img.get_attribute("alt") or ""}
-                    for img in images[:50]  # Limit to first 50
-                ]
-            except:
-                pass
-
-            # Get links
-            try:
-                links = self.driver.find_elements(By.TAG_NAME, "a")
-                page_data["links"] = [
-                    {"href": a.get_attribute("href"), "text": a.text.strip()}
-                    for a in links[:100]  # Limit to first 100
-                ]
-            except:
-                pass
+            else:
+                page_data["title"] = self.driver.title or ""
 
             return html, page_data
 
@@ -184,12 +329,9 @@ class SeleniumScanner:
         self.close()
 
 
-def scan_url_with_fallback(url: str, use_selenium: bool = True) -> Tuple[str, Dict]:
-    """
-    Scan URL with Selenium if available, fallback to requests
-    Returns (html, page_data)
-    """
-    page_data = {
+def _fallback_page_data(url: str) -> Dict:
+    """Empty page_data for the non-Selenium scan paths"""
+    return {
         "url": url,
         "title": "",
         "description": "",
@@ -199,51 +341,125 @@ def scan_url_with_fallback(url: str, use_selenium: bool = True) -> Tuple[str, Di
         "status": "success"
     }
 
+
+def _extract_page_data(page_data: Dict, html: str):
+    """Fill title, description and schema_data from one parse of the HTML"""
+    tree = _parse_html(html)
+    if tree is None:
+        return
+
+    page_data["title"] = (tree.findtext('.//title') or "").strip()
+    page_data["description"] = _first_attr(tree, '//meta[@name="description"]/@content')
+
+    # Get schema data
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        try:
+            page_data["schema_data"].append(_json_loads(script.text or ""))
+        except:
+            pass
+
+
+_shared_scanner = None
+_shared_scanner_lock = threading.Lock()
+
+
+def _get_shared_scanner() -> SeleniumScanner:
+    """Process-wide scanner; Chrome starts on first use and is reused across URLs"""
+    global _shared_scanner
+    if _shared_scanner is None:
+        _shared_scanner = SeleniumScanner(headless=True, timeout=15)
+    return _shared_scanner
+
+
+@atexit.register
+def _close_shared_scanner():
+    if _shared_scanner is not None:
+        _shared_scanner.close()
+
+
+def scan_url_with_fallback(url: str, use_selenium: bool = True, shared: bool = True) -> Tuple[str, Dict]:
+    """
+    Scan URL with Selenium if available, fallback to requests
+    Returns (html, page_data)
+
+    With shared=True the Selenium path reuses one browser across calls
+    instead of launching Chrome per URL.
+    """
+    page_data = _fallback_page_data(url)
+
     # Try Selenium first
     if use_selenium and SELENIUM_AVAILABLE:
         try:
-            with SeleniumScanner(headless=True, timeout=15) as scanner:
-                html, page_data = scanner.scan_url(url)
-                page_data["scan_method"] = "selenium"
-                if html:
-                    return html, page_data
+            if shared:
+                # One driver can only load one page at a time
+                with _shared_scanner_lock:
+                    html, page_data = _get_shared_scanner().scan_url(url)
+            else:
+                with SeleniumScanner(headless=True, timeout=15) as scanner:
+                    html, page_data = scanner.scan_url(url)
+            page_data["scan_method"] = "selenium"
+            if html:
+                return html, page_data
         except Exception as e:
             page_data["selenium_error"] = str(e)
 
     # Fallback to requests
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, timeout=15, headers=headers)
+        response = _SESSION.get(url, timeout=15)
         response.raise_for_status()
         html = response.text
 
         page_data["scan_method"] = "requests"
+        _extract_page_data(page_data, html)
+        return html, page_data
 
-        # Extract basic data from HTML
-        title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.I)
-        if title_match:
-            page_data["title"] = title_match.group(1).strip()
+    except Exception as e:
+        page_data["status"] = f"error: {str(e)}"
+        page_data["scan_method"] = "failed"
+        return "", page_data
 
-        desc_match = re.search(
-            r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']+)["\']',
-            html, re.I
-        )
-        if desc_match:
-            page_data["description"] = desc_match.group(1).strip()
 
-        # Get schema data
-        schema_matches = re.findall(
-            r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-            html, re.I | re.DOTALL
-        )
-        for schema_str in schema_matches:
-            try:
-                page_data["schema_data"].append(json.loads(schema_str))
-            except:
-                pass
+# Async scan throttling: default concurrent requests per host (kept below
+# the overall default so one site can't take every slot), and retries (with
+# exponential backoff or the server's Retry-After) on rate-limit responses
+PER_HOST_CONCURRENCY = 8
+SCAN_RETRIES = 3
+RETRY_STATUSES = (429, 503)
+MAX_RETRY_AFTER = 60
+
 
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1"""
+    try:
+        return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return 2 ** attempt
+
+
+async def _fetch_async(session, url: str, sem: asyncio.BoundedSemaphore,
+                       host_sems: Dict[str, asyncio.Semaphore], per_host: int) -> Tuple[str, Dict]:
+    """Fetch one URL over the shared session and extract its basic page data"""
+    page_data = _fallback_page_data(url)
+    host = urlparse(url).netloc
+    if host not in host_sems:
+        host_sems[host] = asyncio.Semaphore(per_host)
+    try:
+        for attempt in range(SCAN_RETRIES + 1):
+            # Host slot first: tasks queued on a busy host must not sit on
+            # global slots other hosts could use
+            async with host_sems[host], sem:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                    if response.status in RETRY_STATUSES and attempt < SCAN_RETRIES:
+                        delay = _retry_delay(response.headers.get("Retry-After"), attempt)
+                    else:
+                        response.raise_for_status()
+                        html = await response.text()
+                        break
+            # Back off without holding a concurrency slot
+            await asyncio.sleep(delay)
+
+        page_data["scan_method"] = "aiohttp"
+        _extract_page_data(page_data, html)
         return html, page_data
 
     except Exception as e:
@@ -251,7 +467,29 @@ def scan_url_with_fallback(url: str, use_selenium: bool = True) -> Tuple[str, Di
         page_data["scan_method"] = "failed"
         return "", page_data
 
-@dataclass
+
+async def scan_urls_async(urls: List[str], concurrency: int = 32,
+                          per_host: int = PER_HOST_CONCURRENCY) -> List[Tuple[str, Dict]]:
+    """
+    Scan many URLs concurrently without Selenium (no JS rendering)
+    Returns [(html, page_data), ...] in the order of urls
+
+    At most concurrency requests are in flight, and at most per_host of
+    them to any one host.
+
+    Pages that need JS rendering should go through scan_url_with_fallback.
+    """
+    if aiohttp is None:
+        raise RuntimeError("aiohttp not installed. Run: pip install aiohttp")
+
+    per_host = max(1, min(per_host, concurrency))
+    sem = asyncio.BoundedSemaphore(concurrency)
+    host_sems: Dict[str, asyncio.Semaphore] = {}
+    connector = aiohttp.TCPConnector(limit_per_host=per_host)
+    async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+        return await asyncio.gather(*(_fetch_async(session, url, sem, host_sems, per_host) for url in urls))
+
+@dataclass(slots=True)
 class Lead:
     """Lead data model"""
     id: str
@@ -285,26 +523,59 @@ class SmartFillExtractor:
     """Extract business info from scanned page data"""
 
     def __init__(self):
-        # Email regex
-        self.email_pattern = re.compile(
-            r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-            re.IGNORECASE
-        )
-        # Phone regex (US format)
-        self.phone_pattern = re.compile(
-            r'(?:\+1[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}'
-        )
+        self.email_pattern = _EMAIL_RE
+        self.phone_pattern = _PHONE_RE
+
+    def extract_business_info(self, page_data: Dict, html: str, tree=None) -> Dict[str, str]:
+        """
+        Extract all business info in one pass: schema data is walked once and
+        the footer and page text are pulled from a single parse of the HTML
+        """
+        tree, schema = self._prepare(page_data, html, tree)
+        footer_text, page_text = self._texts(tree)
 
-    def extract_business_info(self, page_data: Dict, html: str) -> Dict[str, str]:
-        """Extract all business info from page data and HTML"""
         return {
-            "business_name": self.extract_business_name(page_data, html),
-            "email": self.extract_email(page_data, html),
-            "phone": self.extract_phone(page_data, html),
-            "address": self.extract_address(page_data, html),
+            "business_name": self._name_from(schema, page_data, tree),
+            "email": self._email_from(schema, tree, footer_text, page_text),
+            "phone": self._phone_from(schema, tree, footer_text, page_text),
+            "address": self._address_from(schema, tree, html),
         }
 
-    def extract_business_name(self, page_data: Dict, html: str) -> str:
+    def extract_business_name(self, page_data: Dict, html: str, tree=None) -> str:
+        tree, schema = self._prepare(page_data, html, tree)
+        return self._name_from(schema, page_data, tree)
+
+    def extract_email(self, page_data: Dict, html: str, tree=None) -> str:
+        tree, schema = self._prepare(page_data, html, tree)
+        return self._email_from(schema, tree, *self._texts(tree))
+
+    def extract_phone(self, page_data: Dict, html: str, tree=None) -> str:
+        tree, schema = self._prepare(page_data, html, tree)
+        return self._phone_from(schema, tree, *self._texts(tree))
+
+    def extract_address(self, page_data: Dict, html: str, tree=None) -> str:
+        tree, schema = self._prepare(page_data, html, tree)
+        return self._address_from(schema, tree, html)
+
+    @staticmethod
+    def _prepare(page_data: Dict, html: str, tree=None):
+        """(parsed tree, flattened schema.org data) shared by the extractors"""
+        if tree is None:
+            tree = _parse_html(html)
+        return tree, _flatten_schema(page_data.get("schema_data", []))
+
+    @staticmethod
+    def _texts(tree):
+        """(footer text, page text) of a parsed page; empty when there is no parse"""
+        footer_text = page_text = ""
+        if tree is not None:
+            footer = tree.find('.//footer')
+            if footer is not None:
+                footer_text = _element_text(footer)
+            page_text = _page_text(tree)
+        return footer_text, page_text
+
+    def _name_from(self, schema: Dict, page_data: Dict, tree) -> str:
         """
         Priority:
         1. Schema.org name
@@ -313,26 +584,14 @@ class SmartFillExtractor:
         4. Domain name
         """
         # 1. Schema.org name
-        schema_data = page_data.get("schema_data", [])
-        if schema_data:
-            for schema in schema_data:
-                if isinstance(schema, dict):
-                    name = schema.get("name", "")
-                    if name:
-                        return name
+        if schema.get("name"):
+            return schema["name"]
 
         # 2. og:site_name
-        og_match = re.search(
-            r'property=["\']og:site_name["\'][^>]*content=["\']([^"\']+)["\']',
-            html, re.IGNORECASE
-        )
-        if not og_match:
-            og_match = re.search(
-                r'content=["\']([^"\']+)["\'][^>]*property=["\']og:site_name["\']',
-                html, re.IGNORECASE
-            )
-        if og_match:
-            return og_match.group(1).strip()
+        if tree is not None:
+            site_name = _first_attr(tree, '//meta[@property="og:site_name"]/@content')
+            if site_name:
+                return site_name
 
         # 3. Title before separator
         title = page_data.get("title", "")
@@ -356,7 +615,7 @@ class SmartFillExtractor:
 
         return ""
 
-    def extract_email(self, page_data: Dict, html: str) -> str:
+    def _email_from(self, schema: Dict, tree, footer_text: str, page_text: str) -> str:
         """
         Priority:
         1. Schema.org email
@@ -365,40 +624,31 @@ class SmartFillExtractor:
         4. Full page regex
         """
         # 1. Schema.org email
-        schema_data = page_data.get("schema_data", [])
-        if schema_data:
-            for schema in schema_data:
-                if isinstance(schema, dict):
-                    email = schema.get("email", "")
-                    if email:
-                        return email.replace("mailto:", "")
+        if schema.get("email"):
+            return schema["email"].replace("mailto:", "")
+        if tree is None:
+            return ""
 
         # 2. mailto: links
-        mailto_match = re.search(r'href=["\']mailto:([^"\'?]+)', html, re.IGNORECASE)
-        if mailto_match:
-            return mailto_match.group(1).strip()
+        mailto = _first_attr(tree, '//a[starts-with(@href, "mailto:")]/@href')
+        if mailto:
+            return mailto[len("mailto:"):].split("?")[0].strip()
 
         # 3. Footer regex (look in footer area first)
-        footer_match = re.search(r'<footer[^>]*>(.*?)</footer>', html, re.IGNORECASE | re.DOTALL)
-        if footer_match:
-            footer_html = footer_match.group(1)
-            emails = self.email_pattern.findall(footer_html)
-            if emails:
-                # Filter out common non-business emails
-                for email in emails:
-                    if not any(x in email.lower() for x in ['example', 'test', 'noreply', 'no-reply']):
-                        return email
-
-        # 4. Full page regex
-        all_emails = self.email_pattern.findall(html)
-        if all_emails:
-            for email in all_emails:
-                if not any(x in email.lower() for x in ['example', 'test', 'noreply', 'no-reply', '@sentry', '@seo']):
-                    return email
+        for email in self.email_pattern.findall(footer_text):
+            # Filter out common non-business emails
+            if not _FOOTER_BAD_EMAIL_RE.search(email):
+                return email
+
+        # 4. Full page text regex, tail first
+        for text in _tail_first(page_text):
+            for match in self.email_pattern.finditer(text):
+                if not _BAD_EMAIL_RE.search(match.group(0)):
+                    return match.group(0)
 
         return ""
 
-    def extract_phone(self, page_data: Dict, html: str) -> str:
+    def _phone_from(self, schema: Dict, tree, footer_text: str, page_text: str) -> str:
         """
         Priority:
         1. Schema.org telephone
@@ -407,77 +657,83 @@ class SmartFillExtractor:
         4. Full page regex
         """
         # 1. Schema.org telephone
-        schema_data = page_data.get("schema_data", [])
-        if schema_data:
-            for schema in schema_data:
-                if isinstance(schema, dict):
-                    phone = schema.get("telephone", "")
-                    if phone:
-                        return phone
+        if schema.get("telephone"):
+            return schema["telephone"]
+        if tree is None:
+            return ""
 
         # 2. tel: links
-        tel_match = re.search(r'href=["\']tel:([^"\']+)', html, re.IGNORECASE)
-        if tel_match:
-            return tel_match.group(1).strip()
+        tel = _first_attr(tree, '//a[starts-with(@href, "tel:")]/@href')
+        if tel:
+            return tel[len("tel:"):].strip()
 
         # 3. Footer regex
-        footer_match = re.search(r'<footer[^>]*>(.*?)</footer>', html, re.IGNORECASE | re.DOTALL)
-        if footer_match:
-            footer_html = footer_match.group(1)
-            phones = self.phone_pattern.findall(footer_html)
-            if phones:
-                return phones[0]
-
-        # 4. Full page regex (be more careful to avoid random numbers)
+        phones = self.phone_pattern.findall(footer_text)
+        if phones:
+            return phones[0]
+
+        # 4. Full page text regex (be more careful to avoid random numbers)
         # Look for phone near common labels
-        phone_labeled = re.search(
-            r'(?:phone|tel|call|contact)[:\s]*([+\d\s\(\)-]{10,})',
-            html, re.IGNORECASE
-        )
-        if phone_labeled:
-            return phone_labeled.group(1).strip()
+        for text in _tail_first(page_text):
+            phone_labeled = _PHONE_LABELED_RE.search(text)
+            if phone_labeled:
+                return phone_labeled.group(1).strip()
 
         return ""
 
-    def extract_address(self, page_data: Dict, html: str) -> str:
+    def _address_from(self, schema: Dict, tree, html: str) -> str:
         """
         Priority:
         1. Schema.org address object
         2. <address> HTML tag
         """
         # 1. Schema.org address
-        schema_data = page_data.get("schema_data", [])
-        if schema_data:
-            for schema in schema_data:
-                if isinstance(schema, dict):
-                    address = schema.get("address", {})
-                    if isinstance(address, dict):
-                        parts = []
-                        if address.get("streetAddress"):
-                            parts.append(address["streetAddress"])
-                        if address.get("addressLocality"):
-                            parts.append(address["addressLocality"])
-                        if address.get("addressRegion"):
-                            parts.append(address["addressRegion"])
-                        if address.get("postalCode"):
-                            parts.append(address["postalCode"])
-                        if parts:
-                            return ", ".join(parts)
-                    elif isinstance(address, str):
-                        return address
+        if schema.get("address"):
+            return schema["address"]
 
         # 2. <address> tag
-        address_match = re.search(r'<address[^>]*>(.*?)</address>', html, re.IGNORECASE | re.DOTALL)
-        if address_match:
-            # Clean HTML tags
-            address_text = re.sub(r'<[^>]+>', ' ', address_match.group(1))
-            address_text = ' '.join(address_text.split())
-            if len(address_text) < 200:  # Reasonable length
-                return address_text.strip()
+        if tree is not None:
+            el = tree.find('.//address')
+            address_text = ' '.join(_element_text(el).split()) if el is not None else ""
+        else:
+            # No parse available: strip tags with a regex
+            address_match = _ADDRESS_TAG_RE.search(html)
+            address_text = ' '.join(_HTML_TAG_RE.sub(' ', address_match.group(1)).split()) if address_match else ""
+        if address_text and len(address_text) < 200:  # Reasonable length
+            return address_text
 
         return ""
 
 
+# Fallback code templates for _generate_code_fix, matched against issue titles
+_FIXES = {
+    "No title": '<title>Your Business Name | Primary Service | Location</title>',
+    "Title short": '<title>Your Business Name | Primary Service | Location</title>',
+    "No description": '<meta name="description" content="Your compelling description here (150-160 characters with a call to action)">',
+    "No JSON-LD": '''<script type="application/ld+json">
+{
+  "@context": "https://schema.org",
+  "@type": "Organization",
+  "name": "Your Business",
+  "url": "https://yourdomain.com"
+}
+</script>''',
+    "No canonical": '<link rel="canonical" href="https://yourdomain.com/page">',
+    "No viewport": '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
+    "No H1": '<h1>Your Primary Page Heading with Keywords</h1>',
+}
+_FIXES_BY_KEY = {key.lower(): code for key, code in _FIXES.items()}
+_FIX_RE = re.compile('|'.join(re.escape(key) for key in _FIXES_BY_KEY))
+
+# Book passages per normalised issue text, shared across generators since
+# most audits raise the same handful of issues. Tied to the KB state it was
+# filled from (collection name, chunk count) and cleared when that changes.
+RAG_CACHE_SIZE = 512
+_rag_cache: "OrderedDict[str, List[Dict]]" = OrderedDict()
+_rag_cache_kb_state = None
+_rag_cache_lock = threading.Lock()
+
+
 class RAGReportGenerator:
     """Generate AI-powered recommendations using book knowledge"""
 
@@ -491,7 +747,9 @@ class RAGReportGenerator:
             try:
                 from knowledge_base import SEOKnowledgeBase
                 self.kb = SEOKnowledgeBase().connect()
-                self._kb_available = self.kb.collection.count() > 0
+                count = self.kb.collection.count()
+                self._kb_available = count > 0
+                self._sync_rag_cache((self.kb.collection.name, count))
             except Exception as e:
                 print(f"Knowledge base not available: {e}")
                 self._kb_available = False
@@ -544,9 +802,16 @@ class RAGReportGenerator:
         if not self._ensure_kb():
             return []
 
+        key = ' '.join(issue_text.lower().split())
+        with _rag_cache_lock:
+            cached = _rag_cache.get(key)
+            if cached is not None:
+                _rag_cache.move_to_end(key)
+                return list(cached)
+
         try:
             results = self.kb.search(issue_text, limit=3)
-            return [
+            passages = [
                 {
                     "book_title": r.get("book_title", "SEO Book"),
                     "chapter": r.get("chapter_title", ""),
@@ -559,6 +824,26 @@ class RAGReportGenerator:
             print(f"RAG query error: {e}")
             return []
 
+        with _rag_cache_lock:
+            _rag_cache[key] = passages
+            if len(_rag_cache) > RAG_CACHE_SIZE:
+                _rag_cache.popitem(last=False)
+        return list(passages)
+
+    @staticmethod
+    def clear_rag_cache():
+        """Drop all cached book-knowledge lookups"""
+        with _rag_cache_lock:
+            _rag_cache.clear()
+
+    @staticmethod
+    def _sync_rag_cache(kb_state):
+        """Clear the cache if the KB was re-ingested or reset since it was filled"""
+        global _rag_cache_kb_state
+        if kb_state != _rag_cache_kb_state:
+            RAGReportGenerator.clear_rag_cache()
+            _rag_cache_kb_state = kb_state
+
     def _synthesize_recommendation(self, issue: Dict, book_results: List[Dict]) -> str:
         """Synthesize a recommendation from book knowledge"""
         if not book_results:
@@ -601,30 +886,20 @@ class RAGReportGenerator:
             return engine.gen_fix(issue, proj)
         except:
             # Fallback to simple code templates
-            fixes = {
-                "No title": '<title>Your Business Name | Primary Service | Location</title>',
-                "Title short": '<title>Your Business Name | Primary Service | Location</title>',
-                "No description": '<meta name="description" content="Your compelling description here (150-160 characters with a call to action)">',
-                "No JSON-LD": '''<script type="application/ld+json">
-{
-  "@context": "https://schema.org",
-  "@type": "Organization",
-  "name": "Your Business",
-  "url": "https://yourdomain.com"
-}
-</script>''',
-                "No canonical": '<link rel="canonical" href="https://yourdomain.com/page">',
-                "No viewport": '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
-                "No H1": '<h1>Your Primary Page Heading with Keywords</h1>',
-            }
-
-            for key, code in fixes.items():
-                if key.lower() in title.lower():
-                    return code
+            match = _FIX_RE.search(title.lower())
+            if match:
+                return _FIXES_BY_KEY[match.group(0)]
 
             return f"<!-- Fix needed: {title} -->"
 
 
+# Fixed column order of the leads table, so every insert reuses one statement
+_LEAD_COLS = tuple(f.name for f in fields(Lead))
+_INSERT_SQL = f"INSERT OR REPLACE INTO leads ({', '.join(_LEAD_COLS)}) VALUES ({', '.join('?' * len(_LEAD_COLS))})"
+# Column DEFAULTs from the schema, applied when a lead dict omits them
+_LEAD_DEFAULTS = {"report_generated": 0, "follow_up_status": "new"}
+
+
 class LeadDatabase:
     """SQLite database for lead storage"""
 
@@ -636,6 +911,10 @@ class LeadDatabase:
         """Connect to database and ensure schema exists"""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        # WAL lets reads proceed during writes; NORMAL sync is safe under WAL
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         self._init_schema()
         return self
 
@@ -675,33 +954,33 @@ class LeadDatabase:
 
     def save_lead(self, lead_dict: Dict) -> str:
         """Save a lead to database, returns lead ID"""
+        return self.save_leads([lead_dict])[0]
+
+    def save_leads(self, leads: List[Dict]) -> List[str]:
+        """Save many leads in a single transaction, returns their IDs"""
         cursor = self.conn.cursor()
+        now = datetime.now().isoformat()
 
-        # Generate ID if not present
-        if "id" not in lead_dict or not lead_dict["id"]:
-            lead_dict["id"] = str(uuid.uuid4())[:8]
+        rows = []
+        for lead_dict in leads:
+            # Generate ID if not present
+            if "id" not in lead_dict or not lead_dict["id"]:
+                lead_dict["id"] = secrets.token_hex(4)
 
-        # Set timestamps
-        now = datetime.now().isoformat()
-        lead_dict["created_at"] = lead_dict.get("created_at") or now
-        lead_dict["updated_at"] = now
+            # Set timestamps
+            lead_dict["created_at"] = lead_dict.get("created_at") or now
+            lead_dict["updated_at"] = now
 
-        # Convert booleans to integers
-        if "report_generated" in lead_dict:
-            lead_dict["report_generated"] = 1 if lead_dict["report_generated"] else 0
+            # Convert booleans to integers
+            if "report_generated" in lead_dict:
+                lead_dict["report_generated"] = 1 if lead_dict["report_generated"] else 0
 
-        # Build query
-        columns = list(lead_dict.keys())
-        placeholders = ["?" for _ in columns]
-        values = [lead_dict[c] for c in columns]
+            rows.append(tuple(lead_dict.get(c, _LEAD_DEFAULTS.get(c)) for c in _LEAD_COLS))
 
-        cursor.execute(
-            f"INSERT OR REPLACE INTO leads ({', '.join(columns)}) VALUES ({', '.join(placeholders)})",
-            values
-        )
+        cursor.executemany(_INSERT_SQL, rows)
         self.conn.commit()
 
-        return lead_dict["id"]
+        return [lead_dict["id"] for lead_dict in leads]
 
     def get_lead(self, lead_id: str) -> Optional[Dict]:
         """Get a lead by ID"""
@@ -738,16 +1017,22 @@ class LeadDatabase:
         )
         self.conn.commit()
 
-    def export_to_csv(self, filepath: str):
-        """Export all leads to CSV"""
-        leads = self.get_all_leads(limit=10000)
-        if not leads:
+    def export_to_csv(self, filepath: str, limit: Optional[int] = None):
+        """Export all leads (or the newest `limit`) to CSV, streaming rows from the cursor"""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT * FROM leads ORDER BY created_at DESC LIMIT ?",
+            (-1 if limit is None else limit,)
+        )
+        first = cursor.fetchone()
+        if not first:
             return
 
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=leads[0].keys())
-            writer.writeheader()
-            writer.writerows(leads)
+            writer = csv.writer(f)
+            writer.writerow(first.keys())
+            writer.writerow(first)
+            writer.writerows(cursor)
 
     def get_stats(self) -> Dict:
         """Get lead statistics"""
@@ -789,7 +1074,7 @@ SEO_CHALLENGES = [
 def create_lead_from_scan(url: str, score: float, extracted_info: Dict) -> Lead:
     """Factory function to create a Lead from scan results"""
     return Lead(
-        id=str(uuid.uuid4())[:8],
+        id=secrets.token_hex(4),
         url=url,
         initial_score=score,
         extracted_business_name=extracted_info.get("business_name", ""),
@@ -4,18 +4,102 @@ Applies every rule from AI For SEO Essentials, SEO Marketing Secrets,
 SEO Practice, and SEO 2024: Mastering SEO
 """
 
+import copy
+import hashlib
+import io
 import os
-import sys
 import json
 import shutil
 import re
+import tempfile
+import threading
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
 from pathlib import Path
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# Faster JSON-LD serialization (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Full documents are parsed with lxml (C) when available. Fragments stay on
+# html.parser, since lxml would wrap them in <html><head>.
+try:
+    BeautifulSoup("", "lxml")
+    DOCUMENT_PARSER = "lxml"
+except FeatureNotFound:
+    DOCUMENT_PARSER = "html.parser"
+
+# Threads per project rebuilding HTML files (file I/O and lxml parsing release the GIL)
+FILE_WORKERS = 8
+
+# Output buffer, so a large rebuilt page goes out in one or two write() calls
+WRITE_BUFFER = 1 << 20
+
+# Per-project record of rebuilt file hashes, so unchanged files are skipped on re-runs.
+# Kept beside the project root (.<project>.seobot-cache.json), not in the web root.
+CACHE_SUFFIX = '.seobot-cache.json'
+# Bump when rebuild_html_file's output changes, so cached files are redone
+CACHE_VERSION = 1
+# Start of every generated head; expected within the first HEAD_MARKER_SCAN bytes
+HEAD_MARKER = b'SEO LAW COMPLIANT HEAD - Generated by SEOBOT'
+HEAD_MARKER_SCAN = 2048
+# Per-file results, one JSON object per line, written beside the run's backup
+# (<backup>.report.jsonl) so local paths never land in the web root
+REPORT_SUFFIX = '.report.jsonl'
+
+# Directories never searched for HTML (pruned without descending)
+_EXCLUDED_DIRS = frozenset({'node_modules', '.git', 'dist', 'build'})
+# Marks backup directories (<project>_SEOBOT_BACKUP_<timestamp>), which are never rebuilt
+BACKUP_TAG = '_SEOBOT_BACKUP_'
+
+# Image filename separators turned into spaces for generated alt text
+_ALT_NORMALIZE = re.compile(r'[-_]+')
+
+# Files without an <html> tag are partials/includes and are left alone. Checked
+# on the raw bytes because lxml adds <html> to anything it parses.
+_HTML_TAG = re.compile(rb'<html[\s>]', re.IGNORECASE)
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _link_or_copy(src, dst):
+    """Hard-link src to dst, copying when linking isn't possible (e.g. across filesystems)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _replace_file(path: Path, data: bytes):
+    """Write data to a temp file and os.replace it over path.
+    
+    Backups are hard links to the project files, so writing in place would
+    change the backup too; replacing swaps in a new inode instead.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with open(fd, 'wb', buffering=WRITE_BUFFER) as fh:
+            fh.write(data)
+        if path.exists():
+            shutil.copymode(path, tmp)
+        else:
+            # mkstemp creates 0600; give new files the usual umask-based mode
+            os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
-# Import our knowledge engine
-sys.path.insert(0, str(Path(__file__).parent))
-from seo_knowledge_engine import seo_engine
 
 # Project configurations
 PROJECTS = {
@@ -124,44 +208,99 @@ PROJECTS = {
 }
 
 
-class ProjectRebuilder:
-    """Rebuilds entire projects to comply with SEO Laws"""
+def _build_schema(schema_type: str, name: str, domain: str, description: str, job_title: str,
+                  social_links: tuple, address: tuple, phone: str, hours: tuple, price_range: str) -> dict:
+    """Schema.org JSON-LD for a project, by schema type"""
+    url = f"https://{domain}"
     
-    def __init__(self, project_id: str, project_data: dict):
-        self.project_id = project_id
-        self.data = project_data
-        self.project_path = Path(project_data['path'])
-        self.backup_path = None
-        self.changes = []
-        self.stats = {"files": 0, "fixes": 0, "warnings": 0}
-        
-        # SEO-compliant head template
-        self.head_template = self._generate_head_template()
+    base = {
+        "@context": "https://schema.org",
+        "@type": schema_type,
+        "name": name,
+        "url": url,
+        "description": description[:160],
+        "@id": f"{url}/#{schema_type.lower()}"
+    }
     
-    def _generate_head_template(self) -> str:
-        """Generate SEO-compliant head section based on knowledge engine"""
-        title = self.data['title']
-        desc = self.data['description']
-        url = f"https://{self.data['domain']}"
-        
-        # Validate and fix
-        is_valid, issues = seo_engine.validate_meta_title(title)
-        if not is_valid:
-            if len(title) < 50:
-                title = f"{title} | Professional Services"
-            if len(title) > 60:
-                title = title[:57] + "..."
-        
-        is_valid, issues = seo_engine.validate_meta_description(desc)
-        if not is_valid:
-            if len(desc) < 150:
-                desc = f"{desc} Contact us today!"
-            if len(desc) > 160:
-                desc = desc[:157] + "..."
-        
-        schema = self._generate_schema_json()
-        
-        return f"""<!-- SEO LAW COMPLIANT HEAD - Generated by SEOBOT -->
+    if schema_type == "Person":
+        base.update({
+            "jobTitle": job_title,
+            "sameAs": list(social_links),
+            "worksFor": {
+                "@type": "Organization",
+                "name": name
+            }
+        })
+    
+    elif schema_type == "Organization":
+        base.update({
+            "logo": f"{url}/logo.png",
+            "sameAs": list(social_links),
+            "contactPoint": {
+                "@type": "ContactPoint",
+                "contactType": "customer service",
+                "availableLanguage": ["English"]
+            }
+        })
+    
+    elif schema_type == "LocalBusiness":
+        street, city, region, postal_code = address
+        base.update({
+            "image": f"{url}/logo.png",
+            "address": {
+                "@type": "PostalAddress",
+                "streetAddress": street,
+                "addressLocality": city,
+                "addressRegion": region,
+                "postalCode": postal_code,
+                "addressCountry": "US"
+            },
+            "geo": {
+                "@type": "GeoCoordinates",
+                "latitude": "",
+                "longitude": ""
+            },
+            "telephone": phone,
+            "openingHours": list(hours),
+            "priceRange": price_range
+        })
+    
+    return base
+
+
+@lru_cache(maxsize=32)
+def _serialize_schema(*args) -> str:
+    """Indented JSON-LD for _build_schema(*args), serialized once per distinct input"""
+    schema = _build_schema(*args)
+    if orjson is not None:
+        return orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(schema, indent=2)
+
+
+def _json_line(obj) -> bytes:
+    """obj as one line of JSONL"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b'\n'
+    return json.dumps(obj).encode('utf-8') + b'\n'
+
+
+@lru_cache(maxsize=64)
+def _build_head_template(name: str, domain: str, title: str, desc: str,
+                         keywords: tuple, schema_args: tuple) -> str:
+    """SEO-compliant head section, built once per distinct project data"""
+    url = f"https://{domain}"
+    
+    # Clamp to the SEO length bounds: title 50-60 chars, description 150-160
+    if len(title) < 50:
+        title = f"{title} | Professional Services"
+    if len(title) > 60:
+        title = title[:57] + "..."
+    if len(desc) < 150:
+        desc = f"{desc} Contact us today!"
+    if len(desc) > 160:
+        desc = desc[:157] + "..."
+    
+    template = f"""<!-- SEO LAW COMPLIANT HEAD - Generated by SEOBOT -->
 <!-- Based on: AI For SEO Essentials, SEO Marketing Secrets, SEO Practice, SEO 2024 -->
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
@@ -170,9 +309,9 @@ class ProjectRebuilder:
 <title>{title}</title>
 <meta name="title" content="{title}">
 <meta name="description" content="{desc}">
-<meta name="keywords" content={", ".join(self.data['keywords'][:8])}>
+<meta name="keywords" content={", ".join(keywords)}>
 <meta name="robots" content="index, follow">
-<meta name="author" content="{self.data['name']}">
+<meta name="author" content="{name}">
 <link rel="canonical" href="{url}/">
 
 <!-- Open Graph / Facebook -->
@@ -181,7 +320,7 @@ class ProjectRebuilder:
 <meta property="og:title" content="{title}">
 <meta property="og:description" content="{desc}">
 <meta property="og:image" content="{url}/og-image.jpg">
-<meta property="og:site_name" content="{self.data['name']}">
+<meta property="og:site_name" content="{name}">
 <meta property="og:locale" content="en_US">
 
 <!-- Twitter -->
@@ -197,7 +336,7 @@ class ProjectRebuilder:
 
 <!-- Schema.org JSON-LD -->
 <script type="application/ld+json">
-{json.dumps(schema, indent=2)}
+{_serialize_schema(*schema_args)}
 </script>
 
 <!-- Preconnect for performance -->
@@ -207,131 +346,278 @@ class ProjectRebuilder:
 <!-- Compliance Check -->
 <!-- Title: {len(title)}/60 chars {'PASS' if 50 <= len(title) <= 60 else 'FAIL'} -->
 <!-- Description: {len(desc)}/160 chars {'PASS' if 150 <= len(desc) <= 160 else 'FAIL'} -->
-<!-- Schema: {self.data['schema_type']} -->
+<!-- Schema: {schema_args[0]} -->
+"""
+    # No blank lines or trailing spaces, so the parsed template has no stray
+    # whitespace text nodes to clean up
+    return '\n'.join(line.rstrip() for line in template.splitlines() if line.strip())
+
+
+# Generated config files, filled per project with %-formatting
+_HTACCESS_TMPL = """# SEOBOT Generated .htaccess - SEO Law Compliant
+# Generated: %(generated)s
+# Based on: AI For SEO Essentials, SEO Marketing Secrets, SEO Practice, SEO 2024
+
+# Force HTTPS
+RewriteEngine On
+RewriteCond %%{HTTPS} off
+RewriteRule ^(.*)$ https://%%{HTTP_HOST}/$1 [R=301,L]
+
+# Remove .html extension (clean URLs)
+RewriteCond %%{REQUEST_FILENAME} !-d
+RewriteCond %%{REQUEST_FILENAME}\\.html -f
+RewriteRule ^(.*)$ $1.html [NC,L]
+
+# Enable compression
+<IfModule mod_deflate.c>
+    AddOutputFilterByType DEFLATE text/plain text/html text/xml text/css
+    AddOutputFilterByType DEFLATE application/xml application/xhtml+xml
+    AddOutputFilterByType DEFLATE application/rss+xml application/javascript
+    AddOutputFilterByType DEFLATE application/x-javascript application/json
+</IfModule>
+
+# Browser caching (Page Speed < 3s requirement)
+<IfModule mod_expires.c>
+    ExpiresActive On
+    ExpiresByType image/jpeg "access plus 1 year"
+    ExpiresByType image/gif "access plus 1 year"
+    ExpiresByType image/png "access plus 1 year"
+    ExpiresByType image/webp "access plus 1 year"
+    ExpiresByType image/svg+xml "access plus 1 year"
+    ExpiresByType text/css "access plus 1 month"
+    ExpiresByType application/javascript "access plus 1 month"
+    ExpiresByType font/woff2 "access plus 1 year"
+    ExpiresByType video/mp4 "access plus 1 month"
+    ExpiresDefault "access plus 2 days"
+</IfModule>
+
+# Security headers
+<IfModule mod_headers.c>
+    Header set X-Content-Type-Options "nosniff"
+    Header set X-Frame-Options "SAMEORIGIN"
+    Header set X-XSS-Protection "1; mode=block"
+    Header set Referrer-Policy "strict-origin-when-cross-origin"
+    Header set Permissions-Policy "geolocation=(), microphone=(), camera=()"
+</IfModule>
+
+# Disable server signature
+ServerSignature Off
 """
+
+_ROBOTS_TMPL = """# SEOBOT Generated robots.txt
+User-agent: *
+Allow: /
+
+# Sitemaps
+Sitemap: https://%(domain)s/sitemap.xml
+
+# Disallow admin areas
+Disallow: /admin/
+Disallow: /wp-admin/
+Disallow: /private/
+Disallow: /tmp/
+Disallow: /*.pdf$  # Optional: block PDFs from indexing
+"""
+
+_SITEMAP_TMPL = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url>
+    <loc>https://%(domain)s/</loc>
+    <lastmod>%(today)s</lastmod>
+    <changefreq>weekly</changefreq>
+    <priority>1.0</priority>
+  </url>
+  <url>
+    <loc>https://%(domain)s/about</loc>
+    <lastmod>%(today)s</lastmod>
+    <changefreq>monthly</changefreq>
+    <priority>0.8</priority>
+  </url>
+  <url>
+    <loc>https://%(domain)s/contact</loc>
+    <lastmod>%(today)s</lastmod>
+    <changefreq>monthly</changefreq>
+    <priority>0.8</priority>
+  </url>
+</urlset>
+"""
+
+
+class ProjectRebuilder:
+    """Rebuilds entire projects to comply with SEO Laws"""
+    
+    def __init__(self, project_id: str, project_data: dict):
+        self.project_id = project_id
+        self.data = project_data
+        self.project_path = Path(project_data['path'])
+        self.backup_path = None
+        self.changes = []
+        self.stats = {"files": 0, "fixes": 0, "warnings": 0, "skipped": 0}
+        self._stats_lock = threading.Lock()
+        self._cache = self._load_cache()
+        
+        # SEO-compliant head template, parsed once and copied into each file
+        self.head_template = self._generate_head_template()
+        self._head_nodes = self._parse_head_template()
+        # Cached files are only skipped when written with this same head
+        # (the title also goes into the hidden H1)
+        self._head_hash = hashlib.blake2b(
+            f"{CACHE_VERSION}\0{self.data['title']}\0{self.head_template}".encode('utf-8'),
+            digest_size=16,
+        ).hexdigest()
+    
+    def _load_cache(self) -> dict:
+        """{relative path: {"hash": content hash, "head": head hash}} of files this tool last wrote"""
+        try:
+            return json.loads(self._cache_path().read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_cache(self):
+        _replace_file(self._cache_path(), json.dumps(self._cache, indent=2).encode('utf-8'))
+    
+    def _cache_path(self) -> Path:
+        return self.project_path.parent / f".{self.project_path.name}{CACHE_SUFFIX}"
+    
+    def _cache_key(self, file_path: Path) -> str:
+        return file_path.relative_to(self.project_path).as_posix()
+    
+    def _generate_head_template(self) -> str:
+        """Generate SEO-compliant head section based on knowledge engine"""
+        return _build_head_template(
+            self.data['name'],
+            self.data['domain'],
+            self.data['title'],
+            self.data['description'],
+            tuple(self.data['keywords'][:8]),
+            self._schema_args(),
+        )
+    
+    def _parse_head_template(self) -> list:
+        """Parse the head template into the top-level nodes inserted into every file"""
+        return list(BeautifulSoup(self.head_template, 'html.parser').contents)
+    
+    def _schema_args(self) -> tuple:
+        """Schema inputs as hashable primitives (defaults applied)"""
+        addr = self.data.get('address', {})
+        return (
+            self.data['schema_type'],
+            self.data['name'],
+            self.data['domain'],
+            self.data['description'],
+            self.data.get('job_title', 'Web Designer & Developer'),
+            tuple(self.data.get('social_links', [])),
+            (addr.get('street', ''), addr.get('city', ''), addr.get('region', 'WV'), addr.get('zip', '')),
+            self.data.get('phone', ''),
+            tuple(self.data.get('hours', ["Mo-Fr 09:00-17:00"])),
+            self.data.get('price_range', '$$'),
+        )
     
     def _generate_schema_json(self) -> dict:
         """Generate schema based on type"""
-        schema_type = self.data['schema_type']
-        url = f"https://{self.data['domain']}"
-        
-        base = {
-            "@context": "https://schema.org",
-            "@type": schema_type,
-            "name": self.data['name'],
-            "url": url,
-            "description": self.data['description'][:160],
-            "@id": f"{url}/#{schema_type.lower()}"
-        }
-        
-        if schema_type == "Person":
-            base.update({
-                "jobTitle": self.data.get('job_title', 'Web Designer & Developer'),
-                "sameAs": self.data.get('social_links', []),
-                "worksFor": {
-                    "@type": "Organization",
-                    "name": self.data['name']
-                }
-            })
-        
-        elif schema_type == "Organization":
-            base.update({
-                "logo": f"{url}/logo.png",
-                "sameAs": self.data.get('social_links', []),
-                "contactPoint": {
-                    "@type": "ContactPoint",
-                    "contactType": "customer service",
-                    "availableLanguage": ["English"]
-                }
-            })
-        
-        elif schema_type == "LocalBusiness":
-            addr = self.data.get('address', {})
-            base.update({
-                "image": f"{url}/logo.png",
-                "address": {
-                    "@type": "PostalAddress",
-                    "streetAddress": addr.get('street', ''),
-                    "addressLocality": addr.get('city', ''),
-                    "addressRegion": addr.get('region', 'WV'),
-                    "postalCode": addr.get('zip', ''),
-                    "addressCountry": "US"
-                },
-                "geo": {
-                    "@type": "GeoCoordinates",
-                    "latitude": "",
-                    "longitude": ""
-                },
-                "telephone": self.data.get('phone', ''),
-                "openingHours": self.data.get('hours', ["Mo-Fr 09:00-17:00"]),
-                "priceRange": self.data.get('price_range', '$$')
-            })
-        
-        return base
+        return _build_schema(*self._schema_args())
     
     def create_backup(self):
-        """Create timestamped backup"""
+        """Create timestamped backup (a hard-link snapshot: no file data is copied)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.backup_path = self.project_path.parent / f"{self.project_path.name}_SEOBOT_BACKUP_{timestamp}"
+        self.backup_path = self.project_path.parent / f"{self.project_path.name}{BACKUP_TAG}{timestamp}"
         
         if self.project_path.exists():
             shutil.copytree(self.project_path, self.backup_path, ignore=shutil.ignore_patterns(
-                'node_modules', '.git', 'dist', 'build', '*.tmp', '*_BACKUP_*'
-            ))
+                *_EXCLUDED_DIRS, '*.tmp', '*_BACKUP_*'
+            ), copy_function=_link_or_copy)
             print(f"  [OK] Backup created: {self.backup_path.name}")
     
     def find_html_files(self) -> list:
         """Find all HTML files in project"""
         files = []
-        for pattern in ['**/*.html', '**/*.htm']:
-            files.extend(self.project_path.glob(pattern))
-        return [f for f in files if 'node_modules' not in str(f) and 'dist' not in str(f)]
+        stack = [str(self.project_path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        # DirEntry type checks come from the directory listing, no stat()
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _EXCLUDED_DIRS and BACKUP_TAG not in entry.name:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(('.html', '.htm')):
+                            files.append(Path(entry.path))
+            except OSError:
+                continue
+        return files
     
     def rebuild_html_file(self, file_path: Path) -> dict:
         """Rebuild a single HTML file with SEO compliance"""
         result = {"file": str(file_path), "fixes": [], "errors": []}
         
         try:
-            content = file_path.read_text(encoding='utf-8')
-            soup = BeautifulSoup(content, 'html.parser')
+            # Bytes go straight to the parser, which handles decoding
+            content = file_path.read_bytes()
             
-            if not soup.html:
+            # Skip files still exactly as we last wrote them
+            cache_key = self._cache_key(file_path)
+            if (HEAD_MARKER in content[:HEAD_MARKER_SCAN]
+                    and self._cache.get(cache_key) == {
+                        "hash": hashlib.blake2b(content, digest_size=16).hexdigest(),
+                        "head": self._head_hash,
+                    }):
+                result["skipped"] = True
+                with self._stats_lock:
+                    self.stats["skipped"] += 1
+                return result
+            if not _HTML_TAG.search(content):
                 result["errors"].append("Invalid HTML structure")
                 return result
+            soup = BeautifulSoup(content, DOCUMENT_PARSER)
             
             # Create or replace head
             if not soup.head:
-                soup.html.insert(0, BeautifulSoup("<head></head>", 'html.parser'))
+                soup.html.insert(0, soup.new_tag('head'))
             
             # Clear existing head and insert SEO-compliant version
-            # (Preserve any existing CSS/JS links)
-            existing_links = soup.head.find_all(['link', 'script', 'style'])
-            css_js = [str(tag) for tag in existing_links if tag.get('rel') != ['canonical'] and 'schema.org' not in str(tag)]
+            # (Preserve any existing CSS/JS links; the tags are kept as-is and
+            # re-appended after clear() detaches them, so nothing is re-parsed)
+            css_js = [
+                tag for tag in soup.head.children
+                if getattr(tag, 'name', None) in ('link', 'script', 'style')
+                and tag.get('rel') != ['canonical']
+                and 'schema.org' not in (tag.string or '')
+            ]
             
             soup.head.clear()
             
-            # Insert our SEO head
-            new_head = BeautifulSoup(self.head_template, 'html.parser')
-            for element in new_head.find_all(string=lambda text: isinstance(text, str)):
-                if element.parent.name not in ['script', 'style']:
-                    element.extract()
-            
-            soup.head.append(new_head)
+            # Insert our SEO head (Tag copies need no re-parse)
+            for node in self._head_nodes:
+                soup.head.append(copy.copy(node))
             
             # Re-add CSS/JS (but not duplicates)
-            for tag_str in css_js[:5]:  # Limit to first 5 to avoid bloat
-                try:
-                    soup.head.append(BeautifulSoup(tag_str, 'html.parser'))
-                except:
-                    pass
+            for tag in css_js[:5]:  # Limit to first 5 to avoid bloat
+                soup.head.append(tag)
+            
+            # Gather everything the fixes below touch in one walk of the DOM
+            images, videos, h1s = [], [], []
+            has_main = False
+            content_div = None
+            for tag in soup.descendants:
+                name = getattr(tag, 'name', None)
+                if name == 'img':
+                    images.append(tag)
+                elif name == 'video':
+                    videos.append(tag)
+                elif name == 'h1':
+                    h1s.append(tag)
+                elif name == 'main':
+                    has_main = True
+                elif name == 'div' and content_div is None and (
+                        tag.get('id') in ('root', 'app') or 'content' in (tag.get('class') or [])):
+                    content_div = tag
             
             # Fix images - add alt text and lazy loading
-            images = soup.find_all('img')
             for img in images:
                 if not img.get('alt'):
                     src = img.get('src', '')
                     filename = Path(src).stem
-                    alt_text = filename.replace('-', ' ').replace('_', ' ').title()
+                    alt_text = _ALT_NORMALIZE.sub(' ', filename).title()
                     img['alt'] = alt_text
                     result["fixes"].append(f"Added alt='{alt_text}'")
                 
@@ -345,7 +631,6 @@ class ProjectRebuilder:
                     img['height'] = '600'
             
             # Fix videos - add attributes for SEO
-            videos = soup.find_all('video')
             for video in videos:
                 if not video.get('poster'):
                     video['poster'] = '/video-poster.jpg'
@@ -355,7 +640,6 @@ class ProjectRebuilder:
                 result["fixes"].append("Optimized video element")
             
             # Ensure single H1
-            h1s = soup.find_all('h1')
             if len(h1s) == 0:
                 # Add H1 after body tag
                 h1 = soup.new_tag('h1', style='position: absolute; left: -9999px;')
@@ -365,139 +649,63 @@ class ProjectRebuilder:
                 result["fixes"].append("Added H1 with title")
             elif len(h1s) > 1:
                 # Hide extra H1s visually but keep for structure
-                for i, h1 in enumerate(h1s[1:], 1):
+                for h1 in h1s[1:]:
                     h1.name = 'h2'
                 result["fixes"].append(f"Converted {len(h1s)-1} extra H1s to H2")
             
             # Add semantic landmarks if missing
-            if not soup.find('main'):
-                # Wrap content in main
-                content_div = soup.find('div', id='root') or soup.find('div', id='app') or soup.find('div', class_='content')
+            if not has_main:
+                # Wrap content in main (first div#root/#app/.content in document order)
                 if content_div:
                     content_div.name = 'main'
                     result["fixes"].append("Added semantic <main> landmark")
             
             # Write rebuilt file
-            file_path.write_text(str(soup), encoding='utf-8')
+            output = soup.encode('utf-8')
+            _replace_file(file_path, output)
+            self._cache[cache_key] = {
+                "hash": hashlib.blake2b(output, digest_size=16).hexdigest(),
+                "head": self._head_hash,
+            }
             
             if not result["fixes"]:
                 result["fixes"].append("Verified SEO compliance")
             
-            self.stats["files"] += 1
-            self.stats["fixes"] += len(result["fixes"])
+            with self._stats_lock:
+                self.stats["files"] += 1
+                self.stats["fixes"] += len(result["fixes"])
             
         except Exception as e:
             result["errors"].append(str(e))
-            self.stats["warnings"] += 1
+            with self._stats_lock:
+                self.stats["warnings"] += 1
         
         return result
     
     def generate_htaccess(self):
         """Generate SEO-optimized .htaccess"""
-        htaccess = f"""# SEOBOT Generated .htaccess - SEO Law Compliant
-# Generated: {datetime.now().isoformat()}
-# Based on: AI For SEO Essentials, SEO Marketing Secrets, SEO Practice, SEO 2024
-
-# Force HTTPS
-RewriteEngine On
-RewriteCond %{{HTTPS}} off
-RewriteRule ^(.*)$ https://%{{HTTP_HOST}}/$1 [R=301,L]
-
-# Remove .html extension (clean URLs)
-RewriteCond %{{REQUEST_FILENAME}} !-d
-RewriteCond %{{REQUEST_FILENAME}}\\.html -f
-RewriteRule ^(.*)$ $1.html [NC,L]
-
-# Enable compression
-<IfModule mod_deflate.c>
-    AddOutputFilterByType DEFLATE text/plain text/html text/xml text/css
-    AddOutputFilterByType DEFLATE application/xml application/xhtml+xml
-    AddOutputFilterByType DEFLATE application/rss+xml application/javascript
-    AddOutputFilterByType DEFLATE application/x-javascript application/json
-</IfModule>
-
-# Browser caching (Page Speed < 3s requirement)
-<IfModule mod_expires.c>
-    ExpiresActive On
-    ExpiresByType image/jpeg "access plus 1 year"
-    ExpiresByType image/gif "access plus 1 year"
-    ExpiresByType image/png "access plus 1 year"
-    ExpiresByType image/webp "access plus 1 year"
-    ExpiresByType image/svg+xml "access plus 1 year"
-    ExpiresByType text/css "access plus 1 month"
-    ExpiresByType application/javascript "access plus 1 month"
-    ExpiresByType font/woff2 "access plus 1 year"
-    ExpiresByType video/mp4 "access plus 1 month"
-    ExpiresDefault "access plus 2 days"
-</IfModule>
-
-# Security headers
-<IfModule mod_headers.c>
-    Header set X-Content-Type-Options "nosniff"
-    Header set X-Frame-Options "SAMEORIGIN"
-    Header set X-XSS-Protection "1; mode=block"
-    Header set Referrer-Policy "strict-origin-when-cross-origin"
-    Header set Permissions-Policy "geolocation=(), microphone=(), camera=()"
-</IfModule>
-
-# Disable server signature
-ServerSignature Off
-"""
+        htaccess = _HTACCESS_TMPL % {'generated': datetime.now().isoformat()}
         htaccess_path = self.project_path / '.htaccess'
-        htaccess_path.write_text(htaccess, encoding='utf-8')
+        _replace_file(htaccess_path, htaccess.encode('utf-8'))
         self.changes.append("Created .htaccess with caching & HTTPS rules")
         self.stats["fixes"] += 1
     
     def generate_robots_txt(self):
         """Generate robots.txt"""
-        robots = f"""# SEOBOT Generated robots.txt
-User-agent: *
-Allow: /
-
-# Sitemaps
-Sitemap: https://{self.data['domain']}/sitemap.xml
-
-# Disallow admin areas
-Disallow: /admin/
-Disallow: /wp-admin/
-Disallow: /private/
-Disallow: /tmp/
-Disallow: /*.pdf$  # Optional: block PDFs from indexing
-"""
+        robots = _ROBOTS_TMPL % {'domain': self.data['domain']}
         robots_path = self.project_path / 'robots.txt'
-        robots_path.write_text(robots, encoding='utf-8')
+        _replace_file(robots_path, robots.encode('utf-8'))
         self.changes.append("Created robots.txt")
         self.stats["fixes"] += 1
     
     def generate_sitemap_xml(self):
         """Generate basic sitemap.xml"""
-        url = f"https://{self.data['domain']}"
-        today = datetime.now().strftime("%Y-%m-%d")
-        
-        sitemap = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url>
-    <loc>{url}/</loc>
-    <lastmod>{today}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>1.0</priority>
-  </url>
-  <url>
-    <loc>{url}/about</loc>
-    <lastmod>{today}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.8</priority>
-  </url>
-  <url>
-    <loc>{url}/contact</loc>
-    <lastmod>{today}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.8</priority>
-  </url>
-</urlset>
-"""
+        sitemap = _SITEMAP_TMPL % {
+            'domain': self.data['domain'],
+            'today': datetime.now().strftime("%Y-%m-%d"),
+        }
         sitemap_path = self.project_path / 'sitemap.xml'
-        sitemap_path.write_text(sitemap, encoding='utf-8')
+        _replace_file(sitemap_path, sitemap.encode('utf-8'))
         self.changes.append("Created sitemap.xml")
         self.stats["fixes"] += 1
     
@@ -519,13 +727,20 @@ Disallow: /*.pdf$  # Optional: block PDFs from indexing
         html_files = self.find_html_files()
         print(f"  Found {len(html_files)} HTML files")
         
-        file_results = []
-        for file_path in html_files[:10]:  # Limit to first 10 files
-            print(f"  Processing: {file_path.name}")
-            result = self.rebuild_html_file(file_path)
-            file_results.append(result)
-            if result["fixes"]:
-                print(f"    [OK] {len(result['fixes'])} fixes")
+        # Per-file results go straight to disk; only self.stats is kept in memory
+        report_path = self.backup_path.with_name(self.backup_path.name + REPORT_SUFFIX)
+        with open(report_path, 'wb', buffering=WRITE_BUFFER) as report, \
+                ThreadPoolExecutor(max_workers=max(1, min(FILE_WORKERS, len(html_files)))) as pool:
+            # map yields in file order, so the log reads as before
+            for file_path, result in zip(html_files, pool.map(self.rebuild_html_file, html_files)):
+                print(f"  Processing: {file_path.name}")
+                report.write(_json_line(result))
+                if result.get("skipped"):
+                    print("    [SKIP] unchanged since last rebuild")
+                elif result["fixes"]:
+                    print(f"    [OK] {len(result['fixes'])} fixes")
+        
+        self._save_cache()
         
         # Generate config files
         self.generate_htaccess()
@@ -535,32 +750,91 @@ Disallow: /*.pdf$  # Optional: block PDFs from indexing
         # Summary
         print(f"\n  Summary:")
         print(f"    Files processed: {self.stats['files']}")
+        print(f"    Files skipped (unchanged): {self.stats['skipped']}")
         print(f"    Total fixes: {self.stats['fixes']}")
         print(f"    Warnings: {self.stats['warnings']}")
         print(f"    Backup: {self.backup_path.name if self.backup_path else 'None'}")
+        print(f"    Report: {report_path.name}")
         
         return {
             "success": True,
             "project": self.data['name'],
             "stats": self.stats,
             "backup": str(self.backup_path) if self.backup_path else None,
-            "files": file_results
+            "report": str(report_path)
         }
 
 
+def _rebuild_one(project_id: str, project_data: dict) -> tuple:
+    """Rebuild one project, returning (result, captured output)"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            result = ProjectRebuilder(project_id, project_data).rebuild()
+        except Exception as e:
+            print(f"\n  [ERR] {project_id}: {e}")
+            result = {"success": False, "error": str(e)}
+    return result, output.getvalue()
+
+
+def _rebuild_group(group: list) -> list:
+    """Rebuild (project_id, project_data) pairs one after another in a worker process"""
+    return [(project_id, *_rebuild_one(project_id, project_data)) for project_id, project_data in group]
+
+
+def _paths_nest(a: str, b: str) -> bool:
+    """True when one project root contains the other (or they are the same)"""
+    a = os.path.normcase(os.path.abspath(a))
+    b = os.path.normcase(os.path.abspath(b))
+    try:
+        return os.path.commonpath([a, b]) in (a, b)
+    except ValueError:  # different drives
+        return False
+
+
+def _project_groups() -> list:
+    """PROJECTS split into groups that can run in parallel.
+    
+    Projects whose roots nest share files, so they go in the same group and
+    run sequentially in PROJECTS order.
+    """
+    groups = []
+    for project_id, project_data in PROJECTS.items():
+        merged = [(project_id, project_data)]
+        for group in [g for g in groups if any(_paths_nest(d['path'], project_data['path']) for _, d in g)]:
+            groups.remove(group)
+            merged = group + merged
+        groups.append(merged)
+    order = list(PROJECTS)
+    return [sorted(group, key=lambda item: order.index(item[0])) for group in groups]
+
+
 def rebuild_all():
-    """Rebuild all projects"""
+    """Rebuild all projects (one worker process per group of nested projects)"""
     print("\n" + "="*70)
     print("SEOBOT PROJECT REBUILDER")
     print("Applying SEO Laws from 5 Books to ALL Websites")
     print("="*70)
     
-    results = []
+    results_by_id = {}
+    groups = _project_groups()
     
-    for project_id, project_data in PROJECTS.items():
-        rebuilder = ProjectRebuilder(project_id, project_data)
-        result = rebuilder.rebuild()
-        results.append(result)
+    with ProcessPoolExecutor(max_workers=min(len(groups), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(_rebuild_group, group): group for group in groups}
+        for future in as_completed(futures):
+            try:
+                group_results = future.result()
+            except Exception as e:
+                group_results = [
+                    (project_id, {"success": False, "error": str(e)}, f"\n  [ERR] {project_id}: {e}\n")
+                    for project_id, _ in futures[future]
+                ]
+            for project_id, result, output in group_results:
+                # Each project's log is printed whole so workers don't interleave
+                print(output, end="")
+                results_by_id[project_id] = result
+    
+    results = [results_by_id[project_id] for project_id in PROJECTS]
     
     # Final summary
     print("\n" + "="*70)
@@ -568,10 +842,12 @@ def rebuild_all():
     print("="*70)
     
     total_files = sum(r['stats']['files'] for r in results if r.get('success'))
+    total_skipped = sum(r['stats']['skipped'] for r in results if r.get('success'))
     total_fixes = sum(r['stats']['fixes'] for r in results if r.get('success'))
     
     print(f"\nTotal Projects: {len(PROJECTS)}")
     print(f"Total Files Processed: {total_files}")
+    print(f"Total Files Skipped (unchanged): {total_skipped}")
     print(f"Total SEO Fixes Applied: {total_fixes}")
     print(f"\nSEO Laws Applied:")
     print(f"  • Title tags: 50-60 characters")
@@ -35,8 +35,8 @@ def check_dependencies():
 def setup_knowledge_base(db_path: str = "seo_knowledge.db", force: bool = False):
     """Initialize the knowledge base from EPUB files"""
     
-    if sys.version_info < (3, 8):
-        print("❌ Python 3.8+ required")
+    if sys.version_info < (3, 10):
+        print("❌ Python 3.10+ required")
         return False
 
     print("="*60)
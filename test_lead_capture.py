@@ -0,0 +1,31 @@
+"""Test SmartFill contact extraction on adjacent elements"""
+from lead_capture import SmartFillExtractor
+
+extractor = SmartFillExtractor()
+
+
+def extract(body: str) -> dict:
+    return extractor.extract_business_info({}, f"<html><body>{body}</body></html>")
+
+
+def test_labeled_phone_stops_at_block_end():
+    info = extract("<p>Phone: 555-123-4567</p><p>2024 Copyright</p>")
+    assert info["phone"] == "555-123-4567"
+
+
+def test_labeled_phone_stops_before_address():
+    info = extract("<p>phone: +1 555 222 3333</p><address>12 Road, Charleston WV</address>")
+    assert info["phone"] == "+1 555 222 3333"
+
+
+def test_footer_email_between_spans():
+    info = extract("<footer><span>Email</span><span>sales@acme.com</span><span>Tel</span></footer>")
+    assert info["email"] == "sales@acme.com"
+
+
+if __name__ == "__main__":
+    print("=== LEAD CAPTURE EXTRACTION TEST ===\n")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"[OK] {name}")